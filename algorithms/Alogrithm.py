@@ -17,6 +17,7 @@ from collections import deque, defaultdict
 import heapq
 import weakref
 from functools import lru_cache
+from contextlib import nullcontext
 
 from item import Item
 from itemset import Itemset
@@ -59,6 +60,7 @@ class OptimizedAlgoUPGrowth:
         start_timestamp: Start time of algorithm execution
         end_timestamp: End time of algorithm execution
         hui_count: Number of high utility itemsets found
+        hui_total_utility: Summed utility of the HUIs returned by the last in-memory run
         phuis_count: Number of potential high utility itemsets
         writer: Output file writer
         phuis: List to store potential high utility itemsets
@@ -77,6 +79,7 @@ class OptimizedAlgoUPGrowth:
     start_timestamp: float = 0.0
     end_timestamp: float = 0.0
     hui_count: int = 0
+    hui_total_utility: float = 0.0
     phuis_count: int = 0
     writer: Optional[object] = None
     phuis: List[Itemset] = field(default_factory=list)
@@ -98,14 +101,18 @@ class OptimizedAlgoUPGrowth:
     utility_bounds_cache: Dict[Tuple, int] = field(default_factory=dict)
     frequent_patterns_cache: Dict[Tuple, bool] = field(default_factory=dict)
     timeout_seconds: float = 30.0
+    
+    # Input lines kept by preload() so repeated runs on one file skip re-reading it
+    preloaded_path: Optional[str] = field(default=None, repr=False)
+    preloaded_lines: List[str] = field(default_factory=list, repr=False)
 
-    def run_algorithm(self, input_path: str, output_path: str, min_utility: int) -> None:
+    def run_algorithm(self, input_path: str, output_path: Optional[str], min_utility: int) -> None:
         """
         Run the ultra-fast optimized UPGrowth algorithm with timeout protection.
 
         Args:
             input_path: Path to the input file
-            output_path: Path to the output file
+            output_path: Path to the output file, or None to keep the HUIs in memory only
             min_utility: Minimum utility threshold
         """
         self.max_memory = 0.0
@@ -136,8 +143,8 @@ class OptimizedAlgoUPGrowth:
         self.frequent_patterns_cache.clear()
         self.node_id_counter = 0
 
-        # Open output file
-        with open(output_path, 'w') as self.writer:
+        # Open output file (None leaves self.writer unset, so results are only counted)
+        with open(output_path, 'w') if output_path is not None else nullcontext() as self.writer:
             # Calculate TWU and support for each item
             item_stats = self._calculate_item_statistics(input_path)
 
@@ -191,12 +198,9 @@ class OptimizedAlgoUPGrowth:
             'memory_saved_mb': 0
         }
 
-        # Clear enhanced caches
-        self.projection_cache.clear()
-        self.path_index.clear()
-        self.utility_bounds_cache.clear()
-        self.frequent_patterns_cache.clear()
-        self.node_id_counter = 0
+        # Start from empty results and caches, so a reused instance (a federated client
+        # mining every round) returns this run's HUIs only
+        self.reset_mining_state()
 
         # Calculate TWU and support for each item from in-memory data
         item_stats = self._calculate_item_statistics_memory(transactions, utilities)
@@ -213,14 +217,51 @@ class OptimizedAlgoUPGrowth:
         # Calculate exact utilities from in-memory data
         self._calculate_exact_utilities_memory(transactions, utilities)
 
-        # Filter results by minimum utility
-        high_utility_itemsets = [itemset for itemset in self.phuis if itemset.utility >= min_utility]
+        # Filter results by minimum utility, totalling the kept utilities in the same pass
+        high_utility_itemsets = []
+        total_utility = 0.0
+        for itemset in self.phuis:
+            if itemset.utility >= min_utility:
+                high_utility_itemsets.append(itemset)
+                total_utility += itemset.utility
+        self.hui_total_utility = total_utility
 
         self.end_timestamp = time.time()
         self._check_memory()
 
         return high_utility_itemsets
 
+    def preload(self, input_path: str) -> None:
+        """
+        Read an input file once so later run_algorithm calls on it iterate memory.
+
+        Args:
+            input_path: Path to the input file
+        """
+        with open(input_path, 'r') as file:
+            self.preloaded_lines = file.readlines()
+        self.preloaded_path = input_path
+
+    def reset_mining_state(self) -> None:
+        """Clear mined itemsets, counters and caches so this instance can run again."""
+        self.phuis = []
+        self.hui_count = 0
+        self.phuis_count = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.utility_cache.clear()
+        self.projection_cache.clear()
+        self.path_index.clear()
+        self.utility_bounds_cache.clear()
+        self.frequent_patterns_cache.clear()
+        self.node_id_counter = 0
+
+    def _open_input(self, input_path: str):
+        """Open the input file, or hand back the preloaded lines when they match the path."""
+        if input_path == self.preloaded_path:
+            return nullcontext(self.preloaded_lines)
+        return open(input_path, 'r')
+
     def _calculate_item_statistics_memory(self, transactions: List[List[int]], utilities: List[List[float]]) -> Dict[int, Dict[str, int]]:
         """
         Calculate comprehensive statistics for each item from in-memory data.
@@ -327,7 +368,7 @@ class OptimizedAlgoUPGrowth:
         transaction_count = 0
         max_transactions = 10000  # Limit transactions processed for speed
 
-        with open(input_path, 'r') as file:
+        with self._open_input(input_path) as file:
             for line_num, line in enumerate(file):
                 if transaction_count >= max_transactions:  # Hard limit for speed
                     break
@@ -422,7 +463,7 @@ class OptimizedAlgoUPGrowth:
         transaction_count = 0
         max_transactions = 5000  # Hard limit for ultra-fast processing
 
-        with open(input_path, 'r') as file:
+        with self._open_input(input_path) as file:
             for line in file:
                 if transaction_count >= max_transactions:  # Speed limit
                     break
@@ -1037,7 +1078,7 @@ class OptimizedAlgoUPGrowth:
         # Pre-filter PHUIs to only promising ones
         promising_phuis = [phui for phui in self.phuis if len(phui.get_items()) <= 8][:500]  # Max 500 PHUIs
 
-        with open(input_path, 'r') as file:
+        with self._open_input(input_path) as file:
             for line in file:
                 if transaction_count >= max_transactions:
                     break
@@ -1127,7 +1168,8 @@ class OptimizedAlgoUPGrowth:
         """
         for phui in self.phuis:
             if phui.get_exact_utility() >= min_utility:
-                self._write_out(phui)
+                if self.writer is not None:
+                    self._write_out(phui)
                 self.hui_count += 1
 
     def _write_out(self, hui: Itemset) -> None:
@@ -7,6 +7,7 @@ with the BestEfficientUPGrowth algorithm and supports Laplace differential priva
 Copyright (c) 2024 - Federated FP-Growth with Laplace DP
 """
 
+import os
 import time
 import numpy as np
 import psutil
@@ -15,12 +16,18 @@ from dataclasses import dataclass, field
 from collections import defaultdict
 import copy
 import random
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 from .Alogrithm import OptimizedAlgoUPGrowth
 from .itemset import Itemset
 from .item import Item
 
+# forkserver workers start clean instead of inheriting the parent's imported modules
+_MP_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
+
 
 @dataclass
 class LaplaceDP:
@@ -34,20 +41,46 @@ class LaplaceDP:
         """Calculate noise scale based on epsilon and sensitivity."""
         self.noise_scale = self.sensitivity / self.epsilon
 
+    def sample_batch(self, n: int) -> np.ndarray:
+        """Draw n Laplace noise samples in one vectorized call."""
+        return np.random.laplace(0.0, self.noise_scale, size=n)
+
     def add_laplace_noise(self, value: float) -> float:
         """Add Laplace noise to a numeric value."""
         noise = np.random.laplace(0, self.noise_scale)
         return max(0, value + noise)  # Ensure non-negative utility values
 
-    def add_noise_to_itemset(self, itemset: Itemset) -> Itemset:
-        """Add Laplace noise to an itemset's utility."""
+    @staticmethod
+    def _noisy_copy(itemset: Itemset, noise: float) -> Itemset:
+        """Copy of an itemset with noise added to its utility."""
         noisy_itemset = copy.deepcopy(itemset)
-        noisy_itemset.utility = self.add_laplace_noise(itemset.utility)
+        noisy_itemset.utility = max(0, itemset.utility + noise)  # Ensure non-negative utility values
         return noisy_itemset
 
+    def add_noise_to_itemset(self, itemset: Itemset) -> Itemset:
+        """Add Laplace noise to an itemset's utility."""
+        return self._noisy_copy(itemset, np.random.laplace(0, self.noise_scale))
+
     def add_noise_to_hui_list(self, huis: List[Itemset]) -> List[Itemset]:
         """Add Laplace noise to a list of HUIs."""
-        return [self.add_noise_to_itemset(hui) for hui in huis]
+        # One draw for the whole list instead of a NumPy call per HUI
+        return [self._noisy_copy(hui, noise)
+                for hui, noise in zip(huis, self.sample_batch(len(huis)).tolist())]
+
+
+def _mine_client_huis(transactions: List[List[int]], utilities: List[List[float]],
+                      min_utility: float,
+                      use_pseudo_projection: bool = True) -> Tuple[List[Itemset], float, float, float]:
+    """Mine one client's HUIs in a worker process.
+
+    Returns the HUIs with their utility total, the mining runtime and the
+    worker's peak RSS, since the worker's algorithm instance is discarded.
+    """
+    algorithm = OptimizedAlgoUPGrowth()
+    algorithm.use_pseudo_projection = use_pseudo_projection
+    huis = algorithm.run_algorithm_memory(transactions, utilities, min_utility)
+    return (huis, algorithm.hui_total_utility,
+            algorithm.end_timestamp - algorithm.start_timestamp, algorithm.max_memory)
 
 
 @dataclass
@@ -60,6 +93,9 @@ class FederatedClient:
     min_utility: float
     local_algorithm: OptimizedAlgoUPGrowth = field(default_factory=OptimizedAlgoUPGrowth)
     local_huis: List[Itemset] = field(default_factory=list)
+    local_total_utility: float = 0.0
+    local_runtime: float = 0.0
+    local_max_memory: float = 0.0
     participation_rate: float = 1.0
     data_size: int = 0
 
@@ -70,21 +106,33 @@ class FederatedClient:
     def mine_local_huis(self, use_pseudo_projection: bool = True) -> List[Itemset]:
         """Mine HUIs locally using the efficient algorithm."""
         self.local_algorithm.use_pseudo_projection = use_pseudo_projection
-        self.local_huis = self.local_algorithm.run_algorithm_memory(
+        huis = self.local_algorithm.run_algorithm_memory(
             self.transactions, self.utilities, self.min_utility
         )
+        algorithm = self.local_algorithm
+        self.record_local_mining(huis, algorithm.hui_total_utility,
+                                 algorithm.end_timestamp - algorithm.start_timestamp,
+                                 algorithm.max_memory)
         return self.local_huis
 
+    def record_local_mining(self, huis: List[Itemset], total_utility: float,
+                            runtime: float = 0.0, max_memory: float = 0.0) -> None:
+        """Store locally mined HUIs with the totals and costs reported by the miner."""
+        self.local_huis = huis
+        self.local_total_utility = total_utility
+        self.local_runtime = runtime
+        self.local_max_memory = max_memory
+
     def get_local_statistics(self) -> Dict[str, Any]:
         """Get local mining statistics."""
         return {
             'client_id': self.client_id,
             'data_size': self.data_size,
             'hui_count': len(self.local_huis),
-            'total_utility': sum(hui.utility for hui in self.local_huis),
-            'avg_utility': sum(hui.utility for hui in self.local_huis) / max(1, len(self.local_huis)),
-            'memory_usage': self.local_algorithm.max_memory,
-            'runtime': self.local_algorithm.end_timestamp - self.local_algorithm.start_timestamp
+            'total_utility': self.local_total_utility,
+            'avg_utility': self.local_total_utility / max(1, len(self.local_huis)),
+            'memory_usage': self.local_max_memory,
+            'runtime': self.local_runtime
         }
 
 
@@ -99,6 +147,7 @@ class FederatedFPGrowth:
     client_sampling_rate: float = 1.0
     use_laplace_dp: bool = False
     laplace_dp: Optional[LaplaceDP] = None
+    parallel_clients: bool = False  # Mine clients in separate processes instead of threads
 
     # Performance metrics
     communication_costs: List[float] = field(default_factory=list)
@@ -180,6 +229,22 @@ class FederatedFPGrowth:
 
         return std_size / mean_size if mean_size > 0 else 0.0
 
+    def _create_mining_executor(self, num_clients: int):
+        """Create the executor used for one round of local mining."""
+        if self.parallel_clients:
+            # Local mining is CPU-bound, so processes give real parallelism
+            return ProcessPoolExecutor(max_workers=min(num_clients, os.cpu_count() or 1),
+                                       mp_context=_MP_CONTEXT)
+        return ThreadPoolExecutor(max_workers=min(4, num_clients))
+
+    def _submit_local_mining(self, executor, client: FederatedClient):
+        """Submit a client's local mining job to the executor."""
+        if self.parallel_clients:
+            # Ship plain data rather than the client, whose algorithm state stays local
+            return executor.submit(_mine_client_huis, client.transactions,
+                                   client.utilities, client.min_utility)
+        return executor.submit(client.mine_local_huis)
+
     def run_federated_learning(self) -> List[Itemset]:
         """Run the federated learning process."""
         start_time = time.time()
@@ -189,52 +254,10 @@ class FederatedFPGrowth:
         print(f"Privacy enabled: {self.use_laplace_dp}")
         print(f"Data heterogeneity: {self.data_heterogeneity:.3f}")
 
-        for round_num in range(self.num_rounds):
-            round_start = time.time()
-            print(f"\n--- Round {round_num + 1}/{self.num_rounds} ---")
-
-            # Sample clients for this round
-            selected_clients = self.sample_clients()
-            print(f"Selected {len(selected_clients)} clients")
-
-            # Parallel local mining
-            client_huis_list = []
-            with ThreadPoolExecutor(max_workers=min(4, len(selected_clients))) as executor:
-                future_to_client = {
-                    executor.submit(client.mine_local_huis): client
-                    for client in selected_clients
-                }
-
-                for future in as_completed(future_to_client):
-                    client = future_to_client[future]
-                    try:
-                        local_huis = future.result()
-                        client_huis_list.append(local_huis)
-                        self.client_contributions[client.client_id] += len(local_huis)
-                        print(f"Client {client.client_id}: {len(local_huis)} HUIs")
-                    except Exception as e:
-                        print(f"Client {client.client_id} failed: {e}")
-
-            # Aggregate HUIs
-            round_huis = self.aggregate_huis(client_huis_list)
-            print(f"Aggregated HUIs: {len(round_huis)}")
-
-            # Apply differential privacy
-            if self.use_laplace_dp:
-                round_huis = self.apply_differential_privacy(round_huis)
-                print(f"HUIs after DP: {len(round_huis)}")
-
-            # Update global HUIs
-            self.global_huis = round_huis
-
-            # Calculate metrics
-            comm_cost = self.calculate_communication_cost(client_huis_list)
-            self.communication_costs.append(comm_cost)
-
-            round_time = time.time() - round_start
-            self.round_times.append(round_time)
-
-            print(f"Round time: {round_time:.2f}s, Comm cost: {comm_cost:.0f} bytes")
+        # One executor for the whole run: worker processes start once, not once per round
+        with self._create_mining_executor(max(1, len(self.clients))) as executor:
+            for round_num in range(self.num_rounds):
+                self._run_round(executor, round_num)
 
         self.total_runtime = time.time() - start_time
         print(f"\nFederated learning completed in {self.total_runtime:.2f}s")
@@ -245,6 +268,57 @@ class FederatedFPGrowth:
 
         return self.global_huis
 
+    def _run_round(self, executor, round_num: int) -> None:
+        """Mine, aggregate and record one federated round on a shared executor."""
+        round_start = time.time()
+        print(f"\n--- Round {round_num + 1}/{self.num_rounds} ---")
+
+        # Sample clients for this round
+        selected_clients = self.sample_clients()
+        print(f"Selected {len(selected_clients)} clients")
+
+        # Parallel local mining
+        client_huis_list = []
+        future_to_client = {
+            self._submit_local_mining(executor, client): client
+            for client in selected_clients
+        }
+
+        for future in as_completed(future_to_client):
+            client = future_to_client[future]
+            try:
+                result = future.result()
+                if self.parallel_clients:
+                    # Worker results come back as data; thread mining already recorded itself
+                    client.record_local_mining(*result)
+                local_huis = client.local_huis
+                client_huis_list.append(local_huis)
+                self.client_contributions[client.client_id] += len(local_huis)
+                print(f"Client {client.client_id}: {len(local_huis)} HUIs")
+            except Exception as e:
+                print(f"Client {client.client_id} failed: {e}")
+
+        # Aggregate HUIs
+        round_huis = self.aggregate_huis(client_huis_list)
+        print(f"Aggregated HUIs: {len(round_huis)}")
+
+        # Apply differential privacy
+        if self.use_laplace_dp:
+            round_huis = self.apply_differential_privacy(round_huis)
+            print(f"HUIs after DP: {len(round_huis)}")
+
+        # Update global HUIs
+        self.global_huis = round_huis
+
+        # Calculate metrics
+        comm_cost = self.calculate_communication_cost(client_huis_list)
+        self.communication_costs.append(comm_cost)
+
+        round_time = time.time() - round_start
+        self.round_times.append(round_time)
+
+        print(f"Round time: {round_time:.2f}s, Comm cost: {comm_cost:.0f} bytes")
+
     def get_performance_metrics(self) -> Dict[str, Any]:
         """Get comprehensive performance metrics."""
         return {
@@ -105,4 +105,12 @@ class Itemset:
 
     def __iter__(self):
         """Iterate over items in the itemset."""
-        return iter(self.itemset)
\ No newline at end of file
+        return iter(self.itemset)
+
+
+def utility_totals(itemsets: List[Itemset]) -> Tuple[float, float]:
+    """Total and mean utility of a list of itemsets, without rounding the total."""
+    if not itemsets:
+        return 0.0, 0.0
+    total = float(sum(itemset.utility for itemset in itemsets))
+    return total, total / len(itemsets)
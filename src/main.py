@@ -2,10 +2,25 @@
 Main script to run high utility itemset mining algorithms on user-selected datasets.
 """
 
+import itertools
 import os
+import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
 from Alogrithm import OptimizedAlgoUPGrowth
 
+# Algorithm settings reported in the "Configuration:" block, as (attribute, label)
+CONFIG_ATTRIBUTES = (
+    ('use_utility_pruning', 'Utility pruning'),
+    ('use_support_pruning', 'Support pruning'),
+    ('use_early_termination', 'Early termination'),
+    ('use_smart_caching', 'Smart caching'),
+    ('use_pseudo_projection', 'Pseudo-projection'),
+    ('adaptive_batching', 'Adaptive batching'),
+)
+
+_MISSING = object()
+
 
 def get_available_datasets():
     """Get list of available CSV datasets in the datasets/datasets_algo directory."""
@@ -18,6 +33,78 @@ def get_available_datasets():
     return sorted(csv_files)
 
 
+def _run_one(name, algo_factory, config, selected_file, output_file, min_utility):
+    """Run a single algorithm on the selected dataset and return its statistics."""
+    algorithm = algo_factory()
+
+    print(f"\n{'-' * 60}")
+    print(f"Testing {name} Algorithm")
+    print(f"{'-' * 60}")
+
+    # Apply the optimization settings registered for this algorithm
+    for attr, value in config.items():
+        setattr(algorithm, attr, value)
+
+    print("Configuration:")
+    for attr, label in CONFIG_ATTRIBUTES:
+        value = getattr(algorithm, attr, _MISSING)
+        if value is not _MISSING:
+            print(f"  {label}: {value}")
+
+    try:
+        # Run algorithm
+        start_time = time.perf_counter_ns()
+        print(f"\nRunning {name} algorithm...")
+
+        algorithm.run_algorithm(selected_file, output_file, min_utility)
+
+        execution_time = (time.perf_counter_ns() - start_time) / 1e9
+
+        # Get statistics
+        algorithm.print_stats()
+
+        # Get optimization statistics if available
+        opt_stats = {}
+        if hasattr(algorithm, 'get_optimization_stats'):
+            opt_stats = algorithm.get_optimization_stats()
+
+        print(f"\n--- Performance Results ---")
+        print(f"Execution time: {execution_time:.4f} seconds")
+        print(f"High utility itemsets found: {algorithm.hui_count}")
+        print(f"Memory usage: {algorithm.max_memory:.2f} MB")
+
+        if opt_stats:
+            print(f"Cache efficiency: {opt_stats.get('cache_efficiency', 0):.2%}")
+            print(f"Total items pruned: {opt_stats.get('total_pruned', 0)}")
+            if opt_stats.get('paths_processed', 0) > 0:
+                print(f"Paths processed: {opt_stats.get('paths_processed', 0):,}")
+            if opt_stats.get('batches_created', 0) > 0:
+                print(f"Batches created: {opt_stats.get('batches_created', 0):,}")
+
+        # Show some results
+        print(f"\nResults saved to: {output_file}")
+        if os.path.exists(output_file):
+            print("Sample high utility itemsets found:")
+            with open(output_file, 'r') as f:
+                lines = list(itertools.islice(f, 10))  # Show first 10 itemsets
+            if lines:
+                sys.stdout.write(''.join(f"  {line.rstrip()}\n" for line in lines))
+            else:
+                print("  No high utility itemsets found with current threshold.")
+
+        return {
+            'name': name,
+            'execution_time': execution_time,
+            'hui_count': algorithm.hui_count,
+            'memory_usage': algorithm.max_memory,
+            'opt_stats': opt_stats
+        }
+
+    except Exception as e:
+        print(f"Error running {name}: {e}")
+        return {'name': name, 'error': str(e)}
+
+
 def test_datasets():
     """Test the selected dataset with all algorithms."""
 
@@ -45,143 +132,61 @@ def test_datasets():
         except ValueError:
             print("Please enter a valid number")
 
-    # Check if selected dataset exists
-    if not os.path.exists(selected_file):
-        print(f"Error: {selected_file} not found!")
-        print("Please make sure the dataset file is in the current directory.")
-        return
-
     print("=" * 80)
     print("Testing Dataset with High Utility Itemset Mining")
     print("=" * 80)
     print(f"Dataset: {selected_file}")
 
-    # Check dataset size
-    with open(selected_file, 'r') as f:
-        transaction_count = sum(1 for line in f)
+    # Check dataset size, keeping the first lines as a sample in the same pass
+    try:
+        with open(selected_file, 'rb') as f:
+            sample_lines = list(itertools.islice(f, 5))
+            transaction_count = len(sample_lines) + sum(1 for line in f)
+    except FileNotFoundError:
+        print(f"Error: {selected_file} not found!")
+        print("Please make sure the dataset file is in the current directory.")
+        return
     print(f"Total transactions: {transaction_count}")
 
-    # Show sample transactions
-    print("\nSample transactions:")
-    with open(selected_file, 'r') as f:
-        for i, line in enumerate(f):
-            if i < 5:
-                print(f"  {line.strip()}")
-            else:
-                break
+    # Show sample transactions (interactive runs only)
+    if sys.stdout.isatty() and transaction_count > 0:
+        print("\nSample transactions:")
+        for line in sample_lines:
+            print(f"  {line.decode(errors='replace').strip()}")
 
     # Set minimum utility threshold
     min_utility = int(input("Enter a minimum utility: "))  # Adjust based on your dataset characteristics
     print(f"\nMinimum utility threshold: {min_utility}")
 
-    # Test algorithms
+    # Test algorithms as (name, factory, settings); factories keep each run picklable
     algorithms = [
-        ("Best Efficient UPGrowth", OptimizedAlgoUPGrowth())
+        (sys.intern("Best Efficient UPGrowth"), OptimizedAlgoUPGrowth,
+         {'use_pseudo_projection': True, 'adaptive_batching': True})
     ]
 
-    results = []
-
-    for name, algorithm in algorithms:
-        print(f"\n{'-' * 60}")
-        print(f"Testing {name} Algorithm")
-        print(f"{'-' * 60}")
-
-        # Configure optimization settings for efficient algorithm
-        if name == "Efficient UPGrowth":
-            algorithm.use_utility_pruning = True
-            algorithm.use_support_pruning = True
-            algorithm.use_early_termination = True
-            algorithm.use_smart_caching = True
-
-        # Configure settings for best efficient algorithm
-        if name == "Best Efficient UPGrowth":
-            algorithm.use_pseudo_projection = True
-            algorithm.adaptive_batching = True
-
-        print("Configuration:")
-        if hasattr(algorithm, 'use_utility_pruning'):
-            print(f"  Utility pruning: {algorithm.use_utility_pruning}")
-        if hasattr(algorithm, 'use_support_pruning'):
-            print(f"  Support pruning: {algorithm.use_support_pruning}")
-        if hasattr(algorithm, 'use_early_termination'):
-            print(f"  Early termination: {algorithm.use_early_termination}")
-        if hasattr(algorithm, 'use_smart_caching'):
-            print(f"  Smart caching: {algorithm.use_smart_caching}")
-        if hasattr(algorithm, 'use_pseudo_projection'):
-            print(f"  Pseudo-projection: {algorithm.use_pseudo_projection}")
-        if hasattr(algorithm, 'adaptive_batching'):
-            print(f"  Adaptive batching: {algorithm.adaptive_batching}")
-
-        # Create output file
-        dataset_name = os.path.splitext(os.path.basename(selected_file))[0]
-        output_file = f"results/{dataset_name}_results_{name.lower().replace(' ', '_')}.txt"
-        
-        # Ensure results directory exists
-        os.makedirs("results", exist_ok=True)
+    # Ensure results directory exists (once, before any algorithm runs)
+    os.makedirs("results", exist_ok=True)
 
-        try:
-            # Run algorithm
-            start_time = time.time()
-            print(f"\nRunning {name} algorithm...")
-
-            algorithm.run_algorithm(selected_file, output_file, min_utility)
-
-            end_time = time.time()
-            execution_time = end_time - start_time
-
-            # Get statistics
-            algorithm.print_stats()
-
-            # Get optimization statistics if available
-            opt_stats = {}
-            if hasattr(algorithm, 'get_optimization_stats'):
-                opt_stats = algorithm.get_optimization_stats()
-
-            print(f"\n--- Performance Results ---")
-            print(f"Execution time: {execution_time:.4f} seconds")
-            print(f"High utility itemsets found: {algorithm.hui_count}")
-            print(f"Memory usage: {algorithm.max_memory:.2f} MB")
-
-            if opt_stats:
-                print(f"Cache efficiency: {opt_stats.get('cache_efficiency', 0):.2%}")
-                print(f"Total items pruned: {opt_stats.get('total_pruned', 0)}")
-                if opt_stats.get('paths_processed', 0) > 0:
-                    print(f"Paths processed: {opt_stats.get('paths_processed', 0):,}")
-                if opt_stats.get('batches_created', 0) > 0:
-                    print(f"Batches created: {opt_stats.get('batches_created', 0):,}")
-
-            # Show some results
-            print(f"\nResults saved to: {output_file}")
-            if os.path.exists(output_file):
-                print("Sample high utility itemsets found:")
-                with open(output_file, 'r') as f:
-                    count = 0
-                    for line in f:
-                        if count < 10:  # Show first 10 itemsets
-                            print(f"  {line.strip()}")
-                            count += 1
-                        else:
-                            break
-                    if count == 0:
-                        print("  No high utility itemsets found with current threshold.")
-
-            results.append({
-                'name': name,
-                'execution_time': execution_time,
-                'hui_count': algorithm.hui_count,
-                'memory_usage': algorithm.max_memory,
-                'opt_stats': opt_stats
-            })
-
-        except Exception as e:
-            print(f"Error running {name}: {e}")
-            results.append({
-                'name': name,
-                'execution_time': float('inf'),
-                'hui_count': 0,
-                'memory_usage': 0,
-                'opt_stats': {}
-            })
+    # Output file per algorithm; the dataset part is loop-invariant
+    dataset_name = os.path.splitext(os.path.basename(selected_file))[0]
+    jobs = [
+        (name, factory, config, selected_file,
+         f"results/{dataset_name}_results_{name.lower().replace(' ', '_')}.txt", min_utility)
+        for name, factory, config in algorithms
+    ]
+
+    max_workers = min(len(algorithms), os.cpu_count() or 1)
+    if max_workers > 1:
+        # Independent runs: one process each, so memory stats don't bleed across algorithms
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_run_one, *job) for job in jobs]
+            outcomes = [future.result() for future in futures]
+    else:
+        outcomes = [_run_one(*job) for job in jobs]
+
+    results, failures = [], []
+    for outcome in outcomes:
+        (failures if 'error' in outcome else results).append(outcome)
 
     # Print summary comparison
     print(f"\n{'=' * 80}")
@@ -190,22 +195,34 @@ def test_datasets():
     print(f"{'Algorithm':<25} {'Time (s)':<12} {'HUIs Found':<12} {'Memory (MB)':<12} {'Cache Eff.':<12}")
     print(f"{'-' * 80}")
 
-    for result in results:
-        cache_eff = result['opt_stats'].get('cache_efficiency', 0)
-        print(f"{result['name']:<25} {result['execution_time']:<12.4f} "
-              f"{result['hui_count']:<12} {result['memory_usage']:<12.2f} "
-              f"{cache_eff:<12.2%}")
+    rows = [
+        f"{r['name']:<25} {r['execution_time']:<12.4f} "
+        f"{r['hui_count']:<12} {r['memory_usage']:<12.2f} "
+        f"{r['opt_stats'].get('cache_efficiency', 0):<12.2%}"
+        for r in results
+    ]
+    if rows:
+        sys.stdout.write('\n'.join(rows) + '\n')
 
     # Find best performing algorithm
-    valid_results = [r for r in results if r['execution_time'] != float('inf')]
-    if valid_results:
-        fastest = min(valid_results, key=lambda x: x['execution_time'])
-        most_itemsets = max(valid_results, key=lambda x: x['hui_count'])
+    if results:
+        # Single pass for both highlights
+        fastest = most_itemsets = results[0]
+        for result in results[1:]:
+            if result['execution_time'] < fastest['execution_time']:
+                fastest = result
+            if result['hui_count'] > most_itemsets['hui_count']:
+                most_itemsets = result
 
         print(f"\n--- Performance Highlights ---")
         print(f"Fastest algorithm: {fastest['name']} ({fastest['execution_time']:.4f}s)")
         print(f"Most itemsets found: {most_itemsets['name']} ({most_itemsets['hui_count']} itemsets)")
 
+    if failures:
+        print(f"\n--- Failed Algorithms ---")
+        for failure in failures:
+            print(f"{failure['name']}: {failure['error']}")
+
     print(f"\n{'=' * 80}")
     print("Dataset testing completed!")
     print(f"{'=' * 80}")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Dataset helpers shared by the federated test scripts.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+def parse_item_utility_line(line: bytes) -> Tuple[List[int], List[float]]:
+    """Parse one "item1:utility1 item2:utility2 ..." line.
+
+    Each whitespace-separated token is parsed whole; tokens without a colon
+    are skipped. A malformed token ("a1:5", "1:2:3") raises ValueError so
+    the caller's load fails instead of keeping a partial transaction.
+    """
+    items: List[int] = []
+    utilities: List[float] = []
+    for token in line.split():
+        if b':' not in token:
+            continue
+        item, utility = token.split(b':')
+        items.append(int(item))
+        utilities.append(float(utility))
+    return items, utilities
+
+
+class DatasetCacheMixin:
+    """Parsed-dataset and client-split caches for a tester that defines parse_dataset."""
+
+    def _init_dataset_caches(self):
+        self.dataset_cache = {}  # dataset_path -> (transactions, utilities)
+        # (dataset_path, num_clients, iid) -> per-client (transactions, utilities)
+        self._split_cache: Dict[Tuple[str, int, bool], Tuple[list, list]] = {}
+
+    def load_and_split_dataset(self, dataset_path: str, num_clients: int = 5,
+                               iid: bool = True) -> Tuple[List[List[List[int]]], List[List[List[float]]]]:
+        """Load dataset and split among clients (IID or non-IID)."""
+        # Every sweep re-splits the same dataset; clients only read their lists, so share them
+        split_key = (dataset_path, num_clients, iid)
+        cached = self._split_cache.get(split_key)
+        if cached is not None:
+            return cached
+
+        transactions, utilities = self.parse_dataset(dataset_path)
+
+        # Split data among clients
+        client_transactions = [[] for _ in range(num_clients)]
+        client_utilities = [[] for _ in range(num_clients)]
+
+        if iid:
+            # Round-robin deal: client c gets every num_clients-th transaction starting at c,
+            # which an extended slice builds at its final size in one C-level copy
+            for client_idx in range(num_clients):
+                client_transactions[client_idx] = transactions[client_idx::num_clients]
+                client_utilities[client_idx] = utilities[client_idx::num_clients]
+        else:
+            # Non-IID: sort by transaction length and deal out contiguous chunks.
+            # Stable argsort on lengths gives the same order as sorting the pairs by len
+            lengths = np.fromiter(map(len, transactions), dtype=np.int32, count=len(transactions))
+            order = np.argsort(lengths, kind='stable').tolist()
+            chunk_size = len(order) // num_clients
+
+            for i in range(num_clients):
+                start_idx = i * chunk_size
+                end_idx = start_idx + chunk_size if i < num_clients - 1 else len(order)
+
+                chunk = order[start_idx:end_idx]
+                client_transactions[i] = [transactions[j] for j in chunk]
+                client_utilities[i] = [utilities[j] for j in chunk]
+
+        if transactions:  # Don't pin a failed load
+            self._split_cache[split_key] = (client_transactions, client_utilities)
+        return client_transactions, client_utilities
+
+    def release_dataset(self, dataset_path: str):
+        """Drop the cached parse and client splits of one dataset."""
+        self.dataset_cache.pop(dataset_path, None)
+        for split_key in [key for key in self._split_cache if key[0] == dataset_path]:
+            del self._split_cache[split_key]
@@ -8,12 +8,20 @@ import os
 import sys
 import time
 import argparse
+import functools
+import importlib
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+@functools.lru_cache(maxsize=None)
+def _load_suite(module_name: str):
+    """Import a test suite module once per process and reuse it on later runs."""
+    return importlib.import_module(module_name)
+
+
 def run_test_suite(test_type: str = "all", quick: bool = False):
     """Run specified test suite."""
     
@@ -25,45 +33,43 @@ def run_test_suite(test_type: str = "all", quick: bool = False):
     print(f"Start Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80)
     
-    start_time = time.time()
+    if test_type == "network":
+        print("\n🌐 Network Test Setup Instructions:")
+        print("1. Start server on main laptop:")
+        print("   python test_federated_network_setup.py server --host 0.0.0.0 --port 8888")
+        print("2. Connect clients from other laptops:")
+        print("   python test_federated_network_setup.py client --host <SERVER_IP> --client-name laptop1")
+        print("3. See README.md for detailed network setup instructions")
+        return
+    
+    start_time = time.perf_counter_ns()
     
+    # Independent checks so that "all" runs every suite in one process
     if test_type in ["all", "comprehensive"]:
         print("\n🚀 Running Comprehensive Test Suite...")
         try:
-            from run_comprehensive_federated_tests import main as run_comprehensive
-            run_comprehensive()
+            _load_suite('run_comprehensive_federated_tests').main()
             print("✅ Comprehensive tests completed successfully!")
         except Exception as e:
             print(f"❌ Comprehensive tests failed: {e}")
     
-    elif test_type in ["all", "no_laplace"]:
+    if test_type in ["all", "no_laplace"]:
         print("\n🔓 Running Tests WITHOUT Laplace DP...")
         try:
-            from test_federated_without_laplace import main as run_no_laplace
-            run_no_laplace()
+            _load_suite('test_federated_without_laplace').main()
             print("✅ No-Laplace tests completed successfully!")
         except Exception as e:
             print(f"❌ No-Laplace tests failed: {e}")
     
-    elif test_type in ["all", "with_laplace"]:
+    if test_type in ["all", "with_laplace"]:
         print("\n🔒 Running Tests WITH Laplace DP...")
         try:
-            from test_federated_with_laplace import main as run_with_laplace
-            run_with_laplace()
+            _load_suite('test_federated_with_laplace').main()
             print("✅ Laplace DP tests completed successfully!")
         except Exception as e:
             print(f"❌ Laplace DP tests failed: {e}")
     
-    elif test_type == "network":
-        print("\n🌐 Network Test Setup Instructions:")
-        print("1. Start server on main laptop:")
-        print("   python test_federated_network_setup.py server --host 0.0.0.0 --port 8888")
-        print("2. Connect clients from other laptops:")
-        print("   python test_federated_network_setup.py client --host <SERVER_IP> --client-name laptop1")
-        print("3. See README.md for detailed network setup instructions")
-        return
-    
-    total_time = time.time() - start_time
+    total_time = (time.perf_counter_ns() - start_time) / 1e9
     
     print("\n" + "="*80)
     print("TEST SUITE EXECUTION COMPLETE")
@@ -84,7 +90,7 @@ def run_test_suite(test_type: str = "all", quick: bool = False):
 def check_requirements():
     """Check if required dependencies are available."""
     required_modules = [
-        'numpy', 'pandas', 'matplotlib', 'seaborn', 'psutil'
+        'numpy', 'pandas', 'matplotlib', 'psutil'
     ]
     
     missing_modules = []
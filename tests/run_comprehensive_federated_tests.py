@@ -7,29 +7,198 @@ and generates a unified report covering all Chapter 4 requirements.
 Copyright (c) 2024 - Comprehensive Federated Testing
 """
 
+from __future__ import annotations
+
 import os
 import sys
 import time
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pickle
+import hashlib
+import argparse
+import functools
+import numpy as np
 from datetime import datetime
-from typing import Dict, Any, List
-import traceback
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from types import SimpleNamespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Add parent directory to path
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(_REPO_ROOT)
 
 from test_federated_without_laplace import FederatedTestWithoutLaplace
 from test_federated_with_laplace import FederatedTestWithLaplace
+from federated_fp_growth import _MP_CONTEXT
+
+try:
+    from sample_config import CONFIG
+except ImportError:
+    # sample_config.py is meant to be copied and edited; without it, run with the suite's defaults
+    CONFIG = SimpleNamespace(
+        epsilon_values=(0.1, 0.5, 1.0, 2.0, 5.0),
+        num_clients=5,
+        num_rounds=3,
+        parallel_clients=False
+    )
+
+logger = logging.getLogger(__name__)
+
+# Modules whose code decides a sub-test's result; their source is part of the cache key
+_CACHE_KEY_MODULES = (
+    'Alogrithm', 'federated_fp_growth', 'itemset', 'item', 'dataset_utils',
+    'test_federated_without_laplace', 'test_federated_with_laplace'
+)
+
+
+@functools.lru_cache(maxsize=1)
+def _code_version() -> str:
+    """Hash of the mining and tester sources, so cached results die with code changes."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name in _CACHE_KEY_MODULES:
+        module = sys.modules.get(name)
+        path = getattr(module, '__file__', None)
+        if path:
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _contains_error(result: Any) -> bool:
+    """Whether a sub-test result, or any dict nested in it, reports an error."""
+    if isinstance(result, dict):
+        return 'error' in result or any(_contains_error(value) for value in result.values())
+    return False
+
+
+def _measured(result: Dict[str, Any], key: str) -> float:
+    """A timing from a sub-test result, or NaN when the result was loaded from the cache."""
+    if result.get('source') == 'cache':
+        return float('nan')
+    return result.get(key, 0)
+
+
+def _init_worker_logging(log_queue):
+    """Route a worker process's log records to the parent's queue listener."""
+    root = logging.getLogger()
+    root.handlers[:] = [QueueHandler(log_queue)]
+    root.setLevel(logging.INFO)
+
+
+def _prefetch_files(paths):
+    """Ask the kernel to read files into the page cache ahead of use (POSIX only)."""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    for path in paths:
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _run_dataset_worker(results_dir: str, dataset_path: str, min_utilities: List[int],
+                        use_cache: bool = True) -> Dict[str, Any]:
+    """Run every threshold of one dataset in a worker process, parsing the dataset once."""
+    tester = ComprehensiveFederatedTester(results_dir, use_cache=use_cache)
+    # The outer pool already uses the cores, so sub-tests run in-process
+    return tester.run_dataset_tests(dataset_path, min_utilities, parallel_subtests=False)
+
+
+def _dump_json(obj: Any, path: str):
+    """Write obj to path as indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        # Epsilon sweeps are keyed by float, hence OPT_NON_STR_KEYS
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, default=str, option=options))
+    else:
+        with open(path, 'w') as f:
+            json.dump(obj, f, indent=2, default=str)
+
+
+def _load_json(path: str) -> Any:
+    """Read a JSON file written by _dump_json."""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+@dataclass(slots=True)
+class ConfigMetrics:
+    """Scalar metrics kept in memory for one successful configuration.
+    
+    Missing metrics, and timings of sub-tests loaded from the cache, are NaN.
+    """
+    
+    centralized_huis: int = 0
+    centralized_runtime: float = 0.0
+    federated_huis: int = 0
+    federated_runtime: float = 0.0
+    privacy_hui_loss: float = float('nan')
+    privacy_utility_loss: float = float('nan')
+    pp_runtime_improvement: float = float('nan')
+    pp_memory_improvement: float = float('nan')
+    
+    @classmethod
+    def from_results(cls, config_results: Dict[str, Any]) -> ConfigMetrics:
+        """Extract the summary metrics from one configuration's full results."""
+        centralized = config_results.get('centralized', {})
+        federated = config_results.get('federated_no_dp', {})
+        tradeoff = config_results.get('dp_comparison', {}).get('privacy_utility_tradeoff', {})
+        pseudo_projection = config_results.get('pseudo_projection', {})
+        improvements = pseudo_projection.get('improvements', {})
+        nan = float('nan')
+        if pseudo_projection.get('source') == 'cache':
+            improvements = {}  # Stale timings, so the improvements stay NaN
+        return cls(
+            centralized_huis=centralized.get('num_huis', 0),
+            centralized_runtime=_measured(centralized, 'runtime_seconds'),
+            federated_huis=federated.get('num_global_huis', 0),
+            federated_runtime=_measured(federated, 'runtime_seconds'),
+            privacy_hui_loss=tradeoff.get('hui_loss_percent', nan),
+            privacy_utility_loss=tradeoff.get('utility_loss_percent', nan),
+            pp_runtime_improvement=improvements.get('runtime_improvement_percent', nan),
+            pp_memory_improvement=improvements.get('memory_improvement_percent', nan)
+        )
+
+
+_METRIC_FIELDS = tuple(metric.name for metric in fields(ConfigMetrics))
+_metric_values = attrgetter(*_METRIC_FIELDS)
 
 
 class ComprehensiveFederatedTester:
     """Comprehensive tester that runs all federated learning experiments."""
     
-    def __init__(self, results_dir: str = "results/chapter_four/comprehensive"):
+    def __init__(self, results_dir: str = "results/chapter_four/comprehensive",
+                 viz_dpi: int = 150, use_cache: bool = True, log_queue=None):
         self.results_dir = results_dir
+        self.log_queue = log_queue  # Shared with worker processes when set
+        self.viz_dpi = viz_dpi
+        self.use_cache = use_cache
+        self.cache_dir = os.path.join(results_dir, '.cache')
+        self._dataset_hashes = {}  # dataset_path -> content hash
         os.makedirs(results_dir, exist_ok=True)
         
         # Initialize individual testers
@@ -41,8 +210,15 @@ class ComprehensiveFederatedTester:
         )
         
         self.comprehensive_results = {}
+        self._stats_cache = None  # Summary statistics, reset whenever results change
+        self._summary_df = None  # Per-configuration summary frame, reset alongside the stats
+        self._pp_cache = {}  # dataset_path -> pseudo-projection result from its first threshold
+        
+        # Full per-configuration results live on disk; memory keeps only the summary metrics
+        self.partial_dir = os.path.join(results_dir, 'partial')
+        os.makedirs(self.partial_dir, exist_ok=True)
     
-    def run_all_tests(self):
+    def run_all_tests(self, parallel: bool = True):
         """Run all comprehensive federated learning tests."""
         print("="*80)
         print("COMPREHENSIVE FEDERATED LEARNING TEST SUITE")
@@ -68,10 +244,7 @@ class ComprehensiveFederatedTester:
         ]
         
         # Add transactional dataset if available
-        transactional_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-            'transactional_data.txt'
-        )
+        transactional_path = os.path.join(_REPO_ROOT, 'transactional_data.txt')
         if os.path.exists(transactional_path):
             test_configurations.append({
                 'dataset': 'transactional_data.txt',
@@ -79,14 +252,15 @@ class ComprehensiveFederatedTester:
                 'description': 'Large sparse transactional dataset'
             })
         
+        # Start kernel readahead now so the first parse of each dataset hits the page cache
+        _prefetch_files(os.path.join(_REPO_ROOT, config['dataset']) for config in test_configurations)
+        
         start_time = time.time()
         
+        available_configurations = []
         for config in test_configurations:
             dataset_name = config['dataset']
-            dataset_path = os.path.join(
-                os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
-                dataset_name
-            )
+            dataset_path = os.path.join(_REPO_ROOT, dataset_name)
             
             if not os.path.exists(dataset_path):
                 print(f"Dataset not found: {dataset_path}")
@@ -97,8 +271,14 @@ class ComprehensiveFederatedTester:
             print(f"Description: {config['description']}")
             print(f"{'='*60}")
             
-            dataset_results = self.run_dataset_tests(dataset_path, config['min_utilities'])
-            self.comprehensive_results[dataset_name] = dataset_results
+            if not parallel:
+                dataset_results = self.run_dataset_tests(dataset_path, config['min_utilities'])
+                self.comprehensive_results[dataset_name] = dataset_results
+            else:
+                available_configurations.append((dataset_name, dataset_path, config['min_utilities']))
+        
+        if available_configurations:
+            self.run_configurations_parallel(available_configurations)
         
         total_time = time.time() - start_time
         
@@ -114,82 +294,244 @@ class ComprehensiveFederatedTester:
         print(f"Total execution time: {total_time:.2f} seconds")
         print(f"Results saved in: {self.results_dir}")
     
-    def run_dataset_tests(self, dataset_path: str, min_utilities: List[int]) -> Dict[str, Any]:
+    def run_configurations_parallel(self, configurations: List[Tuple[str, str, List[int]]]):
+        """Fan the datasets out to a process pool, one worker per dataset.
+        
+        Each worker runs run_dataset_tests, so a dataset is parsed once for all of
+        its thresholds instead of once per (dataset, min_utility) job.
+        """
+        collected = {}
+        max_workers = min(len(configurations), os.cpu_count() or 1)
+        pool_kwargs = {}
+        if self.log_queue is not None:
+            pool_kwargs = {'initializer': _init_worker_logging, 'initargs': (self.log_queue,)}
+        
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT, **pool_kwargs) as executor:
+            future_to_dataset = {
+                executor.submit(_run_dataset_worker, self.results_dir, dataset_path,
+                                min_utilities, self.use_cache): dataset_name
+                for dataset_name, dataset_path, min_utilities in configurations
+            }
+            
+            for future in as_completed(future_to_dataset):
+                collected[future_to_dataset[future]] = future.result()
+        
+        # Keep the report in configuration order regardless of completion order
+        for dataset_name, _, _ in configurations:
+            self.comprehensive_results[dataset_name] = collected[dataset_name]
+        self._stats_cache = None
+        self._summary_df = None
+    
+    def _partial_path(self, dataset_name: str, test_key: str) -> str:
+        """Path of the on-disk copy of one configuration's full results."""
+        return os.path.join(self.partial_dir, f'{dataset_name}_{test_key}.json')
+    
+    def _stream_config_results(self, dataset_name: str, test_key: str,
+                               test_results: Dict[str, Any]) -> Any:
+        """Write a configuration's full results to disk and return its ConfigMetrics to keep."""
+        if 'error' in test_results:
+            return test_results
+        
+        _dump_json(test_results, self._partial_path(dataset_name, test_key))
+        return ConfigMetrics.from_results(test_results)
+    
+    def load_full_results(self) -> Dict[str, Any]:
+        """Reassemble the full results of every configuration from the partial files."""
+        return {
+            dataset_name: {
+                test_key: (_load_json(self._partial_path(dataset_name, test_key))
+                           if isinstance(config_results, ConfigMetrics) else config_results)
+                for test_key, config_results in dataset_results.items()
+            }
+            for dataset_name, dataset_results in self.comprehensive_results.items()
+        }
+    
+    def _cached_pseudo_projection(self, dataset_path: str, first_min_utility: int) -> Dict[str, Any]:
+        """Copy the dataset's pseudo-projection result, tagged with where it came from."""
+        # A result loaded from the disk cache keeps its 'cache' source
+        return {'source': f'cached_from_min_util_{first_min_utility}', **self._pp_cache[dataset_path]}
+    
+    def _dataset_hash(self, dataset_path: str) -> str:
+        """Content hash of a dataset file, computed once per path."""
+        if dataset_path not in self._dataset_hashes:
+            digest = hashlib.blake2b(digest_size=16)
+            with open(dataset_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+            self._dataset_hashes[dataset_path] = digest.hexdigest()
+        return self._dataset_hashes[dataset_path]
+    
+    def _cached(self, dataset_path: str, min_utility: int, test_kind: str,
+                compute, **params) -> Dict[str, Any]:
+        """Load a sub-test result from the on-disk cache, or compute and store it."""
+        if not self.use_cache:
+            return compute()
+        
+        key_source = repr((_code_version(), self._dataset_hash(dataset_path), min_utility,
+                           test_kind, sorted(params.items())))
+        key = hashlib.blake2b(key_source.encode(), digest_size=16).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f'{key}.pkl')
+        
+        if os.path.exists(cache_path):
+            print(f"Loaded cached {test_kind} result")
+            with open(cache_path, 'rb') as f:
+                result = pickle.load(f)
+            # Marked so its stored runtimes are not reported as fresh measurements
+            return {**result, 'source': 'cache'}
+        
+        result = compute()
+        
+        # Failed runs are retried next time rather than cached, including sweeps with a failed entry
+        if isinstance(result, dict) and not _contains_error(result):
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        
+        return result
+    
+    def run_config_tests(self, dataset_path: str, min_utility: int,
+                         include_scalability: bool = False,
+                         include_pseudo_projection: bool = True,
+                         parallel_subtests: bool = True) -> Dict[str, Any]:
+        """Run every sub-test for a single dataset and min_utility."""
+        test_results = {}
+        
+        epsilon_values = list(CONFIG.epsilon_values)
+        
+        # 1. Run centralized baseline
+        print("Running centralized baseline...")
+        centralized_result = self._cached(
+            dataset_path, min_utility, 'centralized',
+            lambda: self.tester_no_laplace.run_centralized_baseline(dataset_path, min_utility)
+        )
+        test_results['centralized'] = centralized_result
+        
+        # 2. Test pseudo-projection effectiveness (tree-shape bound, so once per dataset)
+        if include_pseudo_projection:
+            print("Testing pseudo-projection effectiveness...")
+            pp_result = self._cached(
+                dataset_path, min_utility, 'pseudo_projection',
+                lambda: self.tester_no_laplace.test_pseudo_projection_effectiveness(
+                    dataset_path, min_utility
+                )
+            )
+            test_results['pseudo_projection'] = pp_result
+        
+        # 3. Run federated without Laplace DP
+        print("Running federated learning without Laplace DP...")
+        federated_no_dp = self._cached(
+            dataset_path, min_utility, 'federated_no_dp',
+            lambda: self.tester_no_laplace.run_federated_without_laplace(
+                dataset_path, min_utility, num_clients=CONFIG.num_clients, num_rounds=CONFIG.num_rounds,
+                iid=True, parallel_clients=CONFIG.parallel_clients and parallel_subtests
+            ),
+            num_clients=CONFIG.num_clients, num_rounds=CONFIG.num_rounds, iid=True
+        )
+        test_results['federated_no_dp'] = federated_no_dp
+        
+        # 4. Test epsilon impact (with Laplace DP)
+        print("Testing epsilon impact...")
+        epsilon_impact = self._cached(
+            dataset_path, min_utility, 'epsilon_impact',
+            lambda: self.tester_with_laplace.test_epsilon_impact(
+                dataset_path, min_utility, epsilon_values=epsilon_values,
+                parallel=parallel_subtests
+            ),
+            epsilon_values=tuple(epsilon_values)
+        )
+        test_results['epsilon_impact'] = epsilon_impact
+        
+        # 5. Compare with/without Laplace DP
+        print("Comparing with/without Laplace DP...")
+        dp_comparison = self._cached(
+            dataset_path, min_utility, 'dp_comparison',
+            lambda: self.tester_with_laplace.compare_with_without_laplace(
+                dataset_path, min_utility, epsilon=1.0
+            ),
+            epsilon=1.0
+        )
+        test_results['dp_comparison'] = dp_comparison
+        
+        # 6. Test robustness (IID vs Non-IID)
+        print("Testing robustness with non-IID data...")
+        robustness = self._cached(
+            dataset_path, min_utility, 'robustness',
+            lambda: self.tester_with_laplace.test_robustness_non_iid(
+                dataset_path, min_utility, epsilon=1.0
+            ),
+            epsilon=1.0
+        )
+        test_results['robustness'] = robustness
+        
+        # 7. Scalability test (only for first min_utility to save time)
+        if include_scalability:
+            print("Running scalability test...")
+            scalability = self._cached(
+                dataset_path, min_utility, 'scalability',
+                lambda: self.tester_no_laplace.run_scalability_test(
+                    dataset_path, min_utility, parallel=parallel_subtests
+                )
+            )
+            test_results['scalability'] = scalability
+        
+        return test_results
+    
+    def run_dataset_tests(self, dataset_path: str, min_utilities: List[int],
+                          parallel_subtests: bool = True) -> Dict[str, Any]:
         """Run all tests for a specific dataset."""
         dataset_results = {}
+        dataset_name = os.path.basename(dataset_path)
+        testers = (self.tester_no_laplace, self.tester_with_laplace)
+        
+        # Parse the dataset once; every sub-test below splits the cached copy
+        for tester in testers:
+            tester.parse_dataset(dataset_path)
         
         for min_utility in min_utilities:
             print(f"\n--- Testing with min_utility = {min_utility} ---")
             
             test_key = f"min_util_{min_utility}"
-            test_results = {}
             
             try:
-                # 1. Run centralized baseline
-                print("Running centralized baseline...")
-                centralized_result = self.tester_no_laplace.run_centralized_baseline(
-                    dataset_path, min_utility
-                )
-                test_results['centralized'] = centralized_result
-                
-                # 2. Test pseudo-projection effectiveness
-                print("Testing pseudo-projection effectiveness...")
-                pp_result = self.tester_no_laplace.test_pseudo_projection_effectiveness(
-                    dataset_path, min_utility
-                )
-                test_results['pseudo_projection'] = pp_result
-                
-                # 3. Run federated without Laplace DP
-                print("Running federated learning without Laplace DP...")
-                federated_no_dp = self.tester_no_laplace.run_federated_without_laplace(
-                    dataset_path, min_utility, num_clients=5, num_rounds=3, iid=True
-                )
-                test_results['federated_no_dp'] = federated_no_dp
-                
-                # 4. Test epsilon impact (with Laplace DP)
-                print("Testing epsilon impact...")
-                epsilon_impact = self.tester_with_laplace.test_epsilon_impact(
-                    dataset_path, min_utility, epsilon_values=[0.1, 0.5, 1.0, 2.0, 5.0]
-                )
-                test_results['epsilon_impact'] = epsilon_impact
-                
-                # 5. Compare with/without Laplace DP
-                print("Comparing with/without Laplace DP...")
-                dp_comparison = self.tester_with_laplace.compare_with_without_laplace(
-                    dataset_path, min_utility, epsilon=1.0
-                )
-                test_results['dp_comparison'] = dp_comparison
-                
-                # 6. Test robustness (IID vs Non-IID)
-                print("Testing robustness with non-IID data...")
-                robustness = self.tester_with_laplace.test_robustness_non_iid(
-                    dataset_path, min_utility, epsilon=1.0
+                first_threshold = min_utility == min_utilities[0]
+                test_results = self.run_config_tests(
+                    dataset_path, min_utility,
+                    include_scalability=first_threshold,
+                    include_pseudo_projection=first_threshold,
+                    parallel_subtests=parallel_subtests
                 )
-                test_results['robustness'] = robustness
-                
-                # 7. Scalability test (only for first min_utility to save time)
-                if min_utility == min_utilities[0]:
-                    print("Running scalability test...")
-                    scalability = self.tester_no_laplace.run_scalability_test(
-                        dataset_path, min_utility
+                if first_threshold:
+                    if 'pseudo_projection' in test_results:
+                        self._pp_cache[dataset_path] = test_results['pseudo_projection']
+                elif dataset_path in self._pp_cache:
+                    test_results['pseudo_projection'] = self._cached_pseudo_projection(
+                        dataset_path, min_utilities[0]
                     )
-                    test_results['scalability'] = scalability
-                
-                dataset_results[test_key] = test_results
                 
                 # Print summary for this configuration
                 self.print_test_summary(test_key, test_results)
                 
+                dataset_results[test_key] = self._stream_config_results(
+                    dataset_name, test_key, test_results
+                )
+                
             except Exception as e:
-                print(f"Error in test configuration {test_key}: {e}")
-                traceback.print_exc()
+                logger.exception("Error in test configuration %s", test_key)
                 dataset_results[test_key] = {'error': str(e)}
         
+        # Release the parsed transactions and their splits before moving to the next dataset
+        for tester in testers:
+            tester.release_dataset(dataset_path)
+        self._stats_cache = None
+        self._summary_df = None
+        
         return dataset_results
     
     def print_test_summary(self, test_key: str, results: Dict[str, Any]):
         """Print summary of test results."""
-        print(f"\n--- SUMMARY FOR {test_key} ---")
+        parts = [f"\n--- SUMMARY FOR {test_key} ---"]
         
         # Centralized vs Federated comparison
         if 'centralized' in results and 'federated_no_dp' in results:
@@ -198,29 +540,36 @@ class ComprehensiveFederatedTester:
             cent_time = results['centralized'].get('runtime_seconds', 0)
             fed_time = results['federated_no_dp'].get('runtime_seconds', 0)
             
-            print(f"Centralized HUIs: {cent_huis}, Runtime: {cent_time:.2f}s")
-            print(f"Federated HUIs: {fed_huis}, Runtime: {fed_time:.2f}s")
+            parts.append(f"Centralized HUIs: {cent_huis}, Runtime: {cent_time:.2f}s")
+            parts.append(f"Federated HUIs: {fed_huis}, Runtime: {fed_time:.2f}s")
             
             if cent_huis > 0:
                 accuracy = (fed_huis / cent_huis) * 100
-                print(f"Federated Accuracy: {accuracy:.1f}%")
+                parts.append(f"Federated Accuracy: {accuracy:.1f}%")
         
         # Privacy impact
         if 'dp_comparison' in results:
             dp_comp = results['dp_comparison']
             if 'privacy_utility_tradeoff' in dp_comp:
                 tradeoff = dp_comp['privacy_utility_tradeoff']
-                print(f"Privacy Cost - HUI Loss: {tradeoff.get('hui_loss_percent', 0):.1f}%")
-                print(f"Privacy Cost - Utility Loss: {tradeoff.get('utility_loss_percent', 0):.1f}%")
+                parts.append(f"Privacy Cost - HUI Loss: {tradeoff.get('hui_loss_percent', 0):.1f}%")
+                parts.append(f"Privacy Cost - Utility Loss: {tradeoff.get('utility_loss_percent', 0):.1f}%")
         
         # Pseudo-projection effectiveness
         if 'pseudo_projection' in results and 'improvements' in results['pseudo_projection']:
             improvements = results['pseudo_projection']['improvements']
-            print(f"Pseudo-projection - Runtime Improvement: {improvements.get('runtime_improvement_percent', 0):.1f}%")
-            print(f"Pseudo-projection - Memory Improvement: {improvements.get('memory_improvement_percent', 0):.1f}%")
+            parts.append(f"Pseudo-projection - Runtime Improvement: {improvements.get('runtime_improvement_percent', 0):.1f}%")
+            parts.append(f"Pseudo-projection - Memory Improvement: {improvements.get('memory_improvement_percent', 0):.1f}%")
+        
+        # One write keeps the block intact when workers print concurrently
+        sys.stdout.write('\n'.join(parts) + '\n')
+        sys.stdout.flush()
     
     def generate_unified_report(self, total_execution_time: float):
         """Generate a unified comprehensive report."""
+        # Generate CSV summary for easy analysis; its frame also feeds the statistics
+        summary_df = self.generate_csv_summary()
+        
         report = {
             'test_metadata': {
                 'timestamp': datetime.now().isoformat(),
@@ -232,77 +581,52 @@ class ComprehensiveFederatedTester:
                     '4.5: Federated learning with Laplace DP'
                 ]
             },
-            'test_results': self.comprehensive_results,
-            'summary_statistics': self.calculate_summary_statistics(),
+            'test_results': self.load_full_results(),
+            'summary_statistics': self.calculate_summary_statistics(summary_df),
             'key_findings': self.extract_key_findings()
         }
         
         # Save comprehensive report
         report_path = os.path.join(self.results_dir, 'comprehensive_federated_report.json')
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
-        
-        # Generate CSV summary for easy analysis
-        self.generate_csv_summary()
+        _dump_json(report, report_path)
         
         print(f"\nComprehensive report saved to: {report_path}")
         return report
     
-    def calculate_summary_statistics(self) -> Dict[str, Any]:
-        """Calculate summary statistics across all tests."""
+    def calculate_summary_statistics(self, summary_df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Calculate summary statistics across all tests, reusing the cached result."""
+        if self._stats_cache is None:
+            self._stats_cache = self._compute_summary_statistics(summary_df)
+        return self._stats_cache
+    
+    def _compute_summary_statistics(self, summary_df: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """Compute summary statistics from the per-configuration summary frame."""
+        if summary_df is None:
+            summary_df = self._get_summary_df()
+        
+        total_configurations = sum(len(dataset_results) for dataset_results in self.comprehensive_results.values())
         stats = {
             'total_datasets_tested': len(self.comprehensive_results),
-            'total_configurations_tested': 0,
-            'successful_tests': 0,
-            'failed_tests': 0,
+            'total_configurations_tested': total_configurations,
+            'successful_tests': len(summary_df),
+            'failed_tests': total_configurations - len(summary_df),
             'average_federated_accuracy': 0,
             'average_privacy_cost': 0,
             'average_pseudo_projection_improvement': 0
         }
         
-        accuracies = []
-        privacy_costs = []
-        pp_improvements = []
+        if summary_df.empty:
+            return stats
         
-        for dataset_results in self.comprehensive_results.values():
-            for config_results in dataset_results.values():
-                stats['total_configurations_tested'] += 1
-                
-                if 'error' in config_results:
-                    stats['failed_tests'] += 1
-                    continue
-                
-                stats['successful_tests'] += 1
-                
-                # Calculate federated accuracy
-                if ('centralized' in config_results and 
-                    'federated_no_dp' in config_results):
-                    cent_huis = config_results['centralized'].get('num_huis', 0)
-                    fed_huis = config_results['federated_no_dp'].get('num_global_huis', 0)
-                    if cent_huis > 0:
-                        accuracy = (fed_huis / cent_huis) * 100
-                        accuracies.append(accuracy)
-                
-                # Calculate privacy cost
-                if 'dp_comparison' in config_results:
-                    dp_comp = config_results['dp_comparison']
-                    if 'privacy_utility_tradeoff' in dp_comp:
-                        hui_loss = dp_comp['privacy_utility_tradeoff'].get('hui_loss_percent', 0)
-                        privacy_costs.append(hui_loss)
-                
-                # Calculate pseudo-projection improvement
-                if 'pseudo_projection' in config_results:
-                    pp_result = config_results['pseudo_projection']
-                    if 'improvements' in pp_result:
-                        runtime_imp = pp_result['improvements'].get('runtime_improvement_percent', 0)
-                        pp_improvements.append(runtime_imp)
-        
-        if accuracies:
-            stats['average_federated_accuracy'] = sum(accuracies) / len(accuracies)
-        if privacy_costs:
-            stats['average_privacy_cost'] = sum(privacy_costs) / len(privacy_costs)
-        if pp_improvements:
-            stats['average_pseudo_projection_improvement'] = sum(pp_improvements) / len(pp_improvements)
+        # Missing metrics are NaN in the frame, so mean() skips them
+        averages = {
+            'average_federated_accuracy': summary_df.loc[summary_df.centralized_huis > 0, 'federated_accuracy'].mean(),
+            'average_privacy_cost': summary_df['privacy_hui_loss'].mean(),
+            'average_pseudo_projection_improvement': summary_df['pp_runtime_improvement'].mean()
+        }
+        for key, value in averages.items():
+            if not np.isnan(value):
+                stats[key] = float(value)
         
         return stats
     
@@ -328,127 +652,101 @@ class ComprehensiveFederatedTester:
         # Add specific insights based on results
         for dataset_name, dataset_results in self.comprehensive_results.items():
             for config_key, config_results in dataset_results.items():
-                if 'error' in config_results:
+                if not isinstance(config_results, ConfigMetrics):
                     continue
                 
-                # Check for exceptional performance
-                if 'pseudo_projection' in config_results:
-                    pp_result = config_results['pseudo_projection']
-                    if 'improvements' in pp_result:
-                        runtime_imp = pp_result['improvements'].get('runtime_improvement_percent', 0)
-                        if runtime_imp > 30:
-                            findings.append(f"Significant pseudo-projection improvement on {dataset_name}: {runtime_imp:.1f}%")
+                # Check for exceptional performance (NaN when not measured, which never exceeds 30)
+                runtime_imp = config_results.pp_runtime_improvement
+                if runtime_imp > 30:
+                    findings.append(f"Significant pseudo-projection improvement on {dataset_name}: {runtime_imp:.1f}%")
         
         return findings
     
-    def generate_csv_summary(self):
+    def build_summary_frame(self) -> pd.DataFrame:
+        """Build one row per successful configuration; missing metrics are NaN."""
+        import pandas as pd
+        
+        records = [
+            (dataset_name, config_key, *_metric_values(config_results))
+            for dataset_name, dataset_results in self.comprehensive_results.items()
+            for config_key, config_results in dataset_results.items()
+            if isinstance(config_results, ConfigMetrics)
+        ]
+        summary_df = pd.DataFrame.from_records(
+            records, columns=['dataset', 'configuration', *_METRIC_FIELDS]
+        )
+        if summary_df.empty:
+            return summary_df
+        
+        # Calculate derived metrics
+        summary_df['federated_accuracy'] = np.where(
+            summary_df.centralized_huis > 0,
+            summary_df.federated_huis / np.maximum(summary_df.centralized_huis, 1) * 100,
+            0
+        )
+        return summary_df
+    
+    def _get_summary_df(self) -> pd.DataFrame:
+        """Return the summary frame, building it on first use."""
+        if self._summary_df is None:
+            self._summary_df = self.build_summary_frame()
+        return self._summary_df
+    
+    def generate_csv_summary(self) -> pd.DataFrame:
         """Generate CSV summary for easy analysis."""
-        summary_data = []
-        
-        for dataset_name, dataset_results in self.comprehensive_results.items():
-            for config_key, config_results in dataset_results.items():
-                if 'error' in config_results:
-                    continue
-                
-                row = {
-                    'dataset': dataset_name,
-                    'configuration': config_key,
-                    'centralized_huis': config_results.get('centralized', {}).get('num_huis', 0),
-                    'centralized_runtime': config_results.get('centralized', {}).get('runtime_seconds', 0),
-                    'federated_huis': config_results.get('federated_no_dp', {}).get('num_global_huis', 0),
-                    'federated_runtime': config_results.get('federated_no_dp', {}).get('runtime_seconds', 0),
-                    'federated_accuracy': 0,
-                    'privacy_hui_loss': 0,
-                    'privacy_utility_loss': 0,
-                    'pp_runtime_improvement': 0,
-                    'pp_memory_improvement': 0
-                }
-                
-                # Calculate derived metrics
-                if row['centralized_huis'] > 0:
-                    row['federated_accuracy'] = (row['federated_huis'] / row['centralized_huis']) * 100
-                
-                if 'dp_comparison' in config_results:
-                    dp_comp = config_results['dp_comparison']
-                    if 'privacy_utility_tradeoff' in dp_comp:
-                        tradeoff = dp_comp['privacy_utility_tradeoff']
-                        row['privacy_hui_loss'] = tradeoff.get('hui_loss_percent', 0)
-                        row['privacy_utility_loss'] = tradeoff.get('utility_loss_percent', 0)
-                
-                if 'pseudo_projection' in config_results:
-                    pp_result = config_results['pseudo_projection']
-                    if 'improvements' in pp_result:
-                        improvements = pp_result['improvements']
-                        row['pp_runtime_improvement'] = improvements.get('runtime_improvement_percent', 0)
-                        row['pp_memory_improvement'] = improvements.get('memory_improvement_percent', 0)
-                
-                summary_data.append(row)
+        summary_df = self._get_summary_df()
         
         # Save CSV
-        if summary_data:
-            df = pd.DataFrame(summary_data)
+        if not summary_df.empty:
             csv_path = os.path.join(self.results_dir, 'comprehensive_summary.csv')
-            df.to_csv(csv_path, index=False)
+            summary_df.fillna(0).to_csv(csv_path, index=False)
             print(f"CSV summary saved to: {csv_path}")
+        
+        return summary_df
     
     def create_comprehensive_visualizations(self):
         """Create comprehensive visualization dashboard."""
-        plt.style.use('seaborn-v0_8')
+        # Skip building the figure when no configuration succeeded
+        if not any(isinstance(config_results, ConfigMetrics)
+                   for dataset_results in self.comprehensive_results.values()
+                   for config_results in dataset_results.values()):
+            print("No data available for visualization")
+            return
+        
+        import matplotlib.pyplot as plt
+        
+        # The few seaborn-style settings the dashboard relies on, without loading a stylesheet
+        plt.rcParams.update({
+            'axes.grid': True,
+            'grid.alpha': 0.3,
+            'axes.facecolor': '#eaeaf2',
+            'figure.facecolor': 'white'
+        })
         fig = plt.figure(figsize=(20, 16))
         
         # Create a 3x3 grid of subplots
         gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
         
-        # Extract data for visualizations
-        datasets = []
-        centralized_huis = []
-        federated_huis = []
-        centralized_times = []
-        federated_times = []
-        privacy_costs = []
-        pp_improvements = []
-        
-        for dataset_name, dataset_results in self.comprehensive_results.items():
-            for config_key, config_results in dataset_results.items():
-                if 'error' in config_results:
-                    continue
-                
-                datasets.append(f"{dataset_name}_{config_key}")
-                centralized_huis.append(config_results.get('centralized', {}).get('num_huis', 0))
-                federated_huis.append(config_results.get('federated_no_dp', {}).get('num_global_huis', 0))
-                centralized_times.append(config_results.get('centralized', {}).get('runtime_seconds', 0))
-                federated_times.append(config_results.get('federated_no_dp', {}).get('runtime_seconds', 0))
-                
-                # Privacy cost
-                if 'dp_comparison' in config_results:
-                    dp_comp = config_results['dp_comparison']
-                    if 'privacy_utility_tradeoff' in dp_comp:
-                        privacy_costs.append(dp_comp['privacy_utility_tradeoff'].get('hui_loss_percent', 0))
-                    else:
-                        privacy_costs.append(0)
-                else:
-                    privacy_costs.append(0)
-                
-                # Pseudo-projection improvement
-                if 'pseudo_projection' in config_results:
-                    pp_result = config_results['pseudo_projection']
-                    if 'improvements' in pp_result:
-                        pp_improvements.append(pp_result['improvements'].get('runtime_improvement_percent', 0))
-                    else:
-                        pp_improvements.append(0)
-                else:
-                    pp_improvements.append(0)
-        
-        if not datasets:
-            print("No data available for visualization")
-            return
+        # Columns of the cached summary frame feed every panel directly
+        summary_df = self._get_summary_df()
+        datasets = (summary_df['dataset'] + '_' + summary_df['configuration']).to_numpy()
+        centralized_huis = summary_df['centralized_huis'].to_numpy()
+        federated_huis = summary_df['federated_huis'].to_numpy()
+        centralized_times = summary_df['centralized_runtime'].to_numpy()
+        federated_times = summary_df['federated_runtime'].to_numpy()
+        privacy_costs = summary_df['privacy_hui_loss'].fillna(0).to_numpy()
+        pp_improvements = summary_df['pp_runtime_improvement'].fillna(0).to_numpy()
+        
+        # Shared bar positions for every subplot
+        x = np.arange(len(datasets))
+        width = 0.35
+        x_left = x - width/2
+        x_right = x + width/2
         
         # 1. HUI Count Comparison (Centralized vs Federated)
         ax1 = fig.add_subplot(gs[0, 0])
-        x = range(len(datasets))
-        width = 0.35
-        ax1.bar([i - width/2 for i in x], centralized_huis, width, label='Centralized', alpha=0.8)
-        ax1.bar([i + width/2 for i in x], federated_huis, width, label='Federated', alpha=0.8)
+        ax1.bar(x_left, centralized_huis, width, label='Centralized', alpha=0.8)
+        ax1.bar(x_right, federated_huis, width, label='Federated', alpha=0.8)
         ax1.set_xlabel('Test Configurations')
         ax1.set_ylabel('Number of HUIs')
         ax1.set_title('HUI Count: Centralized vs Federated')
@@ -457,8 +755,8 @@ class ComprehensiveFederatedTester:
         
         # 2. Runtime Comparison
         ax2 = fig.add_subplot(gs[0, 1])
-        ax2.bar([i - width/2 for i in x], centralized_times, width, label='Centralized', alpha=0.8)
-        ax2.bar([i + width/2 for i in x], federated_times, width, label='Federated', alpha=0.8)
+        ax2.bar(x_left, centralized_times, width, label='Centralized', alpha=0.8)
+        ax2.bar(x_right, federated_times, width, label='Federated', alpha=0.8)
         ax2.set_xlabel('Test Configurations')
         ax2.set_ylabel('Runtime (seconds)')
         ax2.set_title('Runtime: Centralized vs Federated')
@@ -467,7 +765,7 @@ class ComprehensiveFederatedTester:
         
         # 3. Federated Accuracy
         ax3 = fig.add_subplot(gs[0, 2])
-        accuracies = [(f/max(c, 1))*100 for c, f in zip(centralized_huis, federated_huis)]
+        accuracies = federated_huis / np.maximum(centralized_huis, 1) * 100
         ax3.bar(x, accuracies, alpha=0.8, color='green')
         ax3.set_xlabel('Test Configurations')
         ax3.set_ylabel('Accuracy (%)')
@@ -496,7 +794,7 @@ class ComprehensiveFederatedTester:
         
         # 6. Privacy-Utility Tradeoff Scatter
         ax6 = fig.add_subplot(gs[1, 2])
-        if privacy_costs and accuracies:
+        if len(privacy_costs) and len(accuracies):
             ax6.scatter(privacy_costs, accuracies, alpha=0.7, s=100)
             ax6.set_xlabel('Privacy Cost (HUI Loss %)')
             ax6.set_ylabel('Federated Accuracy (%)')
@@ -527,25 +825,43 @@ class ComprehensiveFederatedTester:
         
         # Save comprehensive visualization
         plot_path = os.path.join(self.results_dir, 'comprehensive_federated_analysis.png')
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        plt.savefig(plot_path, dpi=self.viz_dpi, bbox_inches='tight')
+        fig.clf()
+        plt.close(fig)
         
         print(f"Comprehensive visualizations saved to: {plot_path}")
 
 
-def main():
+def main(use_cache: bool = True):
     """Main function to run comprehensive federated learning tests."""
     print("Starting Comprehensive Federated Learning Test Suite...")
     
+    # A single listener drains log records from this process and every worker
+    log_queue = _MP_CONTEXT.Queue()
+    listener = QueueListener(log_queue, logging.StreamHandler())
+    root = logging.getLogger()
+    queue_handler = QueueHandler(log_queue)
+    root.addHandler(queue_handler)
+    root.setLevel(logging.INFO)
+    listener.start()
+    
     # Initialize comprehensive tester
-    tester = ComprehensiveFederatedTester()
+    tester = ComprehensiveFederatedTester(use_cache=use_cache, log_queue=log_queue)
     
     # Run all tests
-    tester.run_all_tests()
+    try:
+        tester.run_all_tests()
+    finally:
+        root.removeHandler(queue_handler)
+        listener.stop()
     
     print("\nComprehensive testing completed successfully!")
     print(f"All results available in: {tester.results_dir}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Comprehensive federated learning test suite')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Recompute every sub-test instead of loading cached results')
+    args = parser.parse_args()
+    main(use_cache=not args.no_cache)
\ No newline at end of file
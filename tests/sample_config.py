@@ -1,15 +1,18 @@
 # Sample Configuration for Federated Learning Tests
 # Copy this file and modify as needed
 
+from dataclasses import dataclass
+
 # Test Parameters
-MIN_UTILITY_VALUES = [50, 100, 200]
+MIN_UTILITY_VALUES: tuple[int, ...] = (50, 100, 200)
 NUM_CLIENTS = 5
 NUM_ROUNDS = 3
 IID_DISTRIBUTION = True
+PARALLEL_CLIENTS = False  # Set True to mine each client's data in its own process
 
 # Privacy Parameters (for Laplace DP tests)
-EPSILON_VALUES = [0.1, 0.5, 1.0, 2.0, 5.0]
-SENSITIVITY_VALUES = [0.5, 1.0, 2.0, 5.0]
+EPSILON_VALUES: tuple[float, ...] = (0.1, 0.5, 1.0, 2.0, 5.0)
+SENSITIVITY_VALUES: tuple[float, ...] = (0.5, 1.0, 2.0, 5.0)
 
 # Network Parameters
 SERVER_HOST = '0.0.0.0'  # Listen on all interfaces
@@ -17,13 +20,36 @@ SERVER_PORT = 8888
 CLIENT_TIMEOUT = 60
 
 # Dataset Configuration
-DATASETS = [
-    ("chess_data.csv", [50, 100, 200]),
-    ("mushroom_data.txt", [100, 200, 300]),
-    ("transactional_data.txt", [500, 1000, 1500])
-]
+DATASETS: tuple[tuple[str, tuple[int, ...]], ...] = (
+    ("chess_data.csv", (50, 100, 200)),
+    ("mushroom_data.txt", (100, 200, 300)),
+    ("transactional_data.txt", (500, 1000, 1500))
+)
 
 # Performance Settings
 ENABLE_PSEUDO_PROJECTION = True
 BATCH_SIZE = 1000
 ENABLE_CACHING = True
+
+
+@dataclass(frozen=True, slots=True)
+class FedConfig:
+    """Immutable bundle of the settings above."""
+    
+    min_utility_values: tuple[int, ...] = MIN_UTILITY_VALUES
+    num_clients: int = NUM_CLIENTS
+    num_rounds: int = NUM_ROUNDS
+    iid_distribution: bool = IID_DISTRIBUTION
+    parallel_clients: bool = PARALLEL_CLIENTS
+    epsilon_values: tuple[float, ...] = EPSILON_VALUES
+    sensitivity_values: tuple[float, ...] = SENSITIVITY_VALUES
+    server_host: str = SERVER_HOST
+    server_port: int = SERVER_PORT
+    client_timeout: int = CLIENT_TIMEOUT
+    datasets: tuple[tuple[str, tuple[int, ...]], ...] = DATASETS
+    enable_pseudo_projection: bool = ENABLE_PSEUDO_PROJECTION
+    batch_size: int = BATCH_SIZE
+    enable_caching: bool = ENABLE_CACHING
+
+
+CONFIG = FedConfig()
@@ -8,110 +8,331 @@ Copyright (c) 2024 - Network Federated Testing
 """
 
 import socket
+import asyncio
 import threading
 import time
 import json
-import pickle
+import csv
+import math
+import zlib
+import struct
 import sys
 import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import accumulate, islice, repeat
 from typing import Dict, List, Any, Optional, Tuple
 import argparse
+import numpy as np
 from datetime import datetime
+from collections import defaultdict
 import traceback
 
+import msgpack
+
+try:
+    import lz4.frame
+except ImportError:  # Fall back to zlib for compressed payloads
+    lz4 = None
+
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from Alogrithm import OptimizedAlgoUPGrowth
 from itemset import Itemset
-from item import Item
+
+
+# First payload byte: how the rest of the payload is compressed
+_RAW, _LZ4, _ZLIB = b'\x00', b'\x01', b'\x02'
+# Control messages below this size are not worth compressing
+_COMPRESS_THRESHOLD = 256
+# 4-byte big-endian frame length prefix
+_LEN = struct.Struct('!I')
+
+
+def _pack(message: Dict[str, Any]) -> bytes:
+    """Serialize a wire message with msgpack, compressing large payloads."""
+    body = msgpack.packb(message, use_bin_type=True)
+    
+    if len(body) < _COMPRESS_THRESHOLD:
+        return _RAW + body
+    # HUI lists repeat the same item ids, so even the fastest settings shrink them a lot
+    if lz4 is not None:
+        return _LZ4 + lz4.frame.compress(body)
+    return _ZLIB + zlib.compress(body, 1)
+
+
+def _unpack(data: bytes) -> Dict[str, Any]:
+    """Deserialize a wire message produced by _pack."""
+    codec, body = data[:1], memoryview(data)[1:]
+    if codec == _LZ4:
+        if lz4 is None:
+            raise ValueError("Received an LZ4-compressed message but lz4 is not installed")
+        body = lz4.frame.decompress(body)
+    elif codec == _ZLIB:
+        body = zlib.decompress(body)
+    elif codec != _RAW:
+        raise ValueError(f"Unknown payload codec: {codec!r}")
+    
+    return msgpack.unpackb(body, raw=False)
+
+
+def _encode_items(items_sorted) -> List[int]:
+    """Delta-encode ascending item ids so most values pack into a single msgpack byte."""
+    deltas = []
+    previous = 0
+    for item in items_sorted:
+        deltas.append(item - previous)
+        previous = item
+    return deltas
+
+
+def _decode_items(deltas) -> List[int]:
+    """Inverse of _encode_items."""
+    return list(accumulate(deltas))
+
+
+def _is_ascending(key: Tuple[int, ...]) -> bool:
+    """Whether key's items are in ascending order, from one pass over adjacent pairs."""
+    return all(a <= b for a, b in zip(key, islice(key, 1, None)))
+
+
+def _tune_socket(sock: socket.socket, sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None):
+    """Disable Nagle for the small RPCs; set buffer sizes only when explicitly asked."""
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    # A fixed SO_SNDBUF/SO_RCVBUF turns off the kernel's autotuning, so leave them alone by default
+    if sndbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, sndbuf)
+    if rcvbuf:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
+
+
+def _frame(payload: bytes) -> bytes:
+    """Prefix payload with its 4-byte big-endian length."""
+    return _LEN.pack(len(payload)) + payload
+
+
+def _send_frame(sock: socket.socket, payload: bytes):
+    """Send a length-prefixed frame with a single sendall."""
+    # One buffer means one syscall and, for small messages, one TCP segment
+    sock.sendall(_frame(payload))
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytearray]:
+    """Read exactly size bytes into one preallocated buffer; None if the peer closed."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    offset = 0
+    while offset < size:
+        received = sock.recv_into(view[offset:], size - offset)
+        if not received:
+            return None
+        offset += received
+    return buffer
+
+
+def _recv_frame(sock: socket.socket) -> Optional[bytearray]:
+    """Receive one length-prefixed frame; None if the peer closed."""
+    length_bytes = _recv_exact(sock, _LEN.size)
+    if length_bytes is None:
+        return None
+    message_length, = _LEN.unpack(length_bytes)
+    return _recv_exact(sock, message_length)
+
+
+def _mine_partition_candidates(transactions: List[List[int]], utilities: List[List[float]],
+                               min_utility: float) -> List[Tuple[int, ...]]:
+    """Sorted items of each HUI in one partition; module-level so it can run in a worker process."""
+    algorithm = OptimizedAlgoUPGrowth()
+    huis = algorithm.run_algorithm_memory(transactions, utilities, min_utility)
+    return [tuple(sorted(hui.get_items())) for hui in huis]
+
+
+def _partition_utilities(transactions: List[List[int]], utilities: List[List[float]],
+                         candidates: List[Tuple[int, ...]]) -> Dict[Tuple[int, ...], float]:
+    """Exact utility of each candidate itemset within one partition."""
+    totals = defaultdict(float)
+    for transaction, transaction_utilities in zip(transactions, utilities):
+        item_utilities = dict(zip(transaction, transaction_utilities))
+        for candidate in candidates:
+            if all(item in item_utilities for item in candidate):
+                totals[candidate] += sum(item_utilities[item] for item in candidate)
+    return dict(totals)
 
 
 class NetworkFederatedServer:
     """Federated learning server that coordinates multiple network clients."""
     
-    def __init__(self, host: str = '0.0.0.0', port: int = 8888, min_utility: int = 100):
+    def __init__(self, host: str = '0.0.0.0', port: int = 8888, min_utility: int = 100,
+                 sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None):
         self.host = host
         self.port = port
         self.min_utility = min_utility
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
         self.clients = {}
-        self.global_huis = []
+        # The event loop's executor threads write self.clients while the round thread reads it
+        self._clients_lock = threading.Lock()
+        # Registered clients that have not uploaded HUIs yet; the event is set whenever it is empty
+        self._pending_clients = set()
+        self._all_reported = threading.Event()
+        self._all_reported.set()
+        # Running utility sum and count per items key over the connected clients' current uploads,
+        # as parallel arrays indexed through _agg_index so the threshold pass runs in NumPy
+        self._agg_index: Dict[Tuple[int, ...], int] = {}
+        self._agg_keys: List[Tuple[int, ...]] = []
+        self._agg_sums = np.zeros(1024, dtype=np.float64)
+        self._agg_counts = np.zeros(1024, dtype=np.int64)
+        # HUIs are kept as (sorted items tuple, utility) pairs; the server never needs Itemset objects
+        self.global_huis: List[Tuple[Tuple[int, ...], float]] = []
+        # Packed 'global_model' frame shared by every request until the next aggregation
+        self._global_model_wire: Optional[bytes] = None
         self.round_results = []
         self.server_socket = None
         self.running = False
+        self.loop = None
+        self._shutdown = None
+        # Stream writers by client id; only touched on the event loop's thread
+        self._writers: Dict[str, asyncio.StreamWriter] = {}
+        # Bounded pool for message processing; named threads make stack dumps readable
+        self.pool = ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 2,
+                                       thread_name_prefix='fed-server-worker')
         
     def start_server(self):
         """Start the federated learning server."""
         try:
-            self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-            self.server_socket.bind((self.host, self.port))
-            self.server_socket.listen(10)
-            self.running = True
-            
-            print(f"Federated Learning Server started on {self.host}:{self.port}")
-            print(f"Minimum utility threshold: {self.min_utility}")
-            print("Waiting for clients to connect...")
-            
-            while self.running:
-                try:
-                    client_socket, client_address = self.server_socket.accept()
-                    print(f"Client connected from {client_address}")
-                    
-                    # Handle client in separate thread
-                    client_thread = threading.Thread(
-                        target=self.handle_client,
-                        args=(client_socket, client_address)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                    
-                except socket.error as e:
-                    if self.running:
-                        print(f"Socket error: {e}")
-                    break
-                    
+            asyncio.run(self._serve())
         except Exception as e:
             print(f"Error starting server: {e}")
             traceback.print_exc()
         finally:
             self.stop_server()
     
-    def handle_client(self, client_socket: socket.socket, client_address: Tuple[str, int]):
+    async def _serve(self):
+        """Accept and serve every client on one event loop until stop_server is called."""
+        self.loop = asyncio.get_running_loop()
+        self._shutdown = asyncio.Event()
+        
+        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # Set on the listener too, so the window size is advertised during the handshake
+        _tune_socket(self.server_socket, self.sndbuf, self.rcvbuf)
+        self.server_socket.bind((self.host, self.port))
+        
+        server = await asyncio.start_server(self.handle_client, sock=self.server_socket, backlog=10)
+        self.running = True
+        
+        print(f"Federated Learning Server started on {self.host}:{self.port}")
+        print(f"Minimum utility threshold: {self.min_utility}")
+        print("Waiting for clients to connect...")
+        
+        async with server:
+            await self._shutdown.wait()
+    
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
         """Handle communication with a connected client."""
+        client_address = writer.get_extra_info('peername')
         client_id = f"{client_address[0]}:{client_address[1]}"
+        _tune_socket(writer.get_extra_info('socket'), self.sndbuf, self.rcvbuf)
+        self._writers[client_id] = writer
+        print(f"Client connected from {client_address}")
         
         try:
             while self.running:
                 # Receive message from client
-                message = self.receive_message(client_socket)
+                message = await self.receive_message(reader)
                 if not message:
                     break
                 
-                response = self.process_client_message(client_id, message)
+                # Decoding HUIs is CPU work, so keep it off the loop that serves the other clients
+                response = await self.loop.run_in_executor(
+                    self.pool, self.process_client_message, client_id, message
+                )
                 
                 # Send response back to client
-                self.send_message(client_socket, response)
+                await self.send_message(writer, response)
+                
+                if isinstance(response, dict) and response.get('type') == 'huis_received':
+                    # Only now is the ack ahead of any push on this connection
+                    self._upload_acknowledged(client_id)
                 
         except Exception as e:
             print(f"Error handling client {client_id}: {e}")
         finally:
-            client_socket.close()
-            if client_id in self.clients:
-                del self.clients[client_id]
+            self._writers.pop(client_id, None)
+            writer.close()
+            with self._clients_lock:
+                client_info = self.clients.pop(client_id, None)
+                if client_info and 'local_huis' in client_info:
+                    # Aggregation only covers connected clients
+                    self._apply_contribution(client_info['local_huis'], -1)
+                self._mark_reported(client_id)  # Don't keep a round waiting on a client that left
             print(f"Client {client_id} disconnected")
     
-    def process_client_message(self, client_id: str, message: Dict[str, Any]) -> Dict[str, Any]:
-        """Process message from client and return response."""
+    def _upload_acknowledged(self, client_id: str):
+        """Make client_id push-eligible and stop waiting on it, once its upload ack is written."""
+        with self._clients_lock:
+            client_info = self.clients.get(client_id)
+            if client_info is not None and 'local_huis' in client_info:
+                client_info['awaiting_push'] = True
+                self._mark_reported(client_id)
+    
+    def _mark_reported(self, client_id: str):
+        """Stop waiting on client_id; wakes the round once nobody is pending. Hold _clients_lock."""
+        self._pending_clients.discard(client_id)
+        if not self._pending_clients:
+            self._all_reported.set()
+    
+    def _apply_contribution(self, local_huis: List[Tuple[Tuple[int, ...], float]], sign: int):
+        """Add (sign=1) or withdraw (sign=-1) one client's HUIs from the running totals. Hold _clients_lock."""
+        if not local_huis:
+            return
+        
+        index = self._agg_index
+        keys = self._agg_keys
+        slots = np.empty(len(local_huis), dtype=np.intp)
+        utilities = np.empty(len(local_huis), dtype=np.float64)
+        for i, (items_key, utility) in enumerate(local_huis):
+            # One probe per HUI; a running (old + new) / 2 would weight later clients more
+            slot = index.get(items_key)
+            if slot is None:
+                slot = index[items_key] = len(keys)
+                keys.append(items_key)
+            slots[i] = slot
+            utilities[i] = utility
+        
+        if len(keys) > len(self._agg_sums):
+            # Grow by doubling so appends stay amortized O(1)
+            capacity = max(len(keys), 2 * len(self._agg_sums))
+            sums = np.zeros(capacity, dtype=np.float64)
+            counts = np.zeros(capacity, dtype=np.int64)
+            sums[:len(self._agg_sums)] = self._agg_sums
+            counts[:len(self._agg_counts)] = self._agg_counts
+            self._agg_sums, self._agg_counts = sums, counts
+        
+        # add.at, unlike fancy-index +=, also accumulates repeated slots correctly
+        np.add.at(self._agg_sums, slots, sign * utilities)
+        np.add.at(self._agg_counts, slots, sign)
+    
+    def _client_snapshot(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Copy of the connected clients, safe to iterate while handlers run."""
+        with self._clients_lock:
+            return list(self.clients.items())
+    
+    def process_client_message(self, client_id: str, message: Dict[str, Any]) -> Dict[str, Any] | bytes:
+        """Process message from client and return response, as a dict or already packed."""
         msg_type = message.get('type')
         
         if msg_type == 'register':
             # Register new client
-            self.clients[client_id] = {
-                'status': 'registered',
-                'last_seen': time.time(),
-                'data_info': message.get('data_info', {})
-            }
+            with self._clients_lock:
+                self.clients[client_id] = {
+                    'status': 'registered',
+                    'last_seen': time.time(),
+                    'data_info': message.get('data_info', {})
+                }
+                self._pending_clients.add(client_id)
+                self._all_reported.clear()
             
             return {
                 'type': 'registration_ack',
@@ -124,19 +345,27 @@ class NetworkFederatedServer:
             # Receive local HUIs from client
             local_huis_data = message.get('huis', [])
             
-            # Convert received data back to Itemset objects
-            local_huis = []
-            for hui_data in local_huis_data:
-                itemset = Itemset()
-                for item_id in hui_data['items']:
-                    itemset.add_item(Item(item_id, 1))  # Default utility
-                itemset.utility = hui_data['utility']
-                local_huis.append(itemset)
+            # Clients send items already sorted, so the decoded tuple is the aggregation key as is
+            local_huis = [(tuple(accumulate(deltas)), utility) for deltas, utility in local_huis_data]
+            # Reject out-of-order keys instead of aggregating them under a different itemset
+            if not all(_is_ascending(key) for key, _ in local_huis):
+                return {
+                    'type': 'error',
+                    'message': 'HUI items must arrive sorted in ascending order'
+                }
             
             # Store client's local HUIs
-            if client_id in self.clients:
-                self.clients[client_id]['local_huis'] = local_huis
-                self.clients[client_id]['last_seen'] = time.time()
+            with self._clients_lock:
+                if client_id in self.clients:
+                    # A re-upload replaces the client's previous contribution
+                    previous = self.clients[client_id].get('local_huis')
+                    if previous:
+                        self._apply_contribution(previous, -1)
+                    self._apply_contribution(local_huis, 1)
+                    self.clients[client_id]['local_huis'] = local_huis
+                    self.clients[client_id]['last_seen'] = time.time()
+                    # Reported and push-eligible only after handle_client has written the ack
+                    self.clients[client_id]['awaiting_push'] = False
             
             return {
                 'type': 'huis_received',
@@ -145,19 +374,8 @@ class NetworkFederatedServer:
             }
         
         elif msg_type == 'request_global_model':
-            # Send current global model to client
-            global_huis_data = []
-            for hui in self.global_huis:
-                global_huis_data.append({
-                    'items': hui.get_items(),
-                    'utility': hui.utility
-                })
-            
-            return {
-                'type': 'global_model',
-                'global_huis': global_huis_data,
-                'num_global_huis': len(self.global_huis)
-            }
+            # Send current global model to client, packed once per aggregation
+            return self._global_model_payload()
         
         else:
             return {
@@ -165,12 +383,33 @@ class NetworkFederatedServer:
                 'message': f'Unknown message type: {msg_type}'
             }
     
+    def _global_model_payload(self) -> bytes:
+        """Packed 'global_model' message for the current global HUIs."""
+        wire = self._global_model_wire
+        if wire is None:  # No aggregation has run yet
+            wire = self._global_model_wire = self._pack_global_model(self.global_huis)
+        return wire
+    
+    @staticmethod
+    def _pack_global_model(global_huis: List[Tuple[Tuple[int, ...], float]]) -> bytes:
+        """Pack global_huis as a 'global_model' message."""
+        # [items, utility] pairs instead of dicts, so the keys are not repeated per HUI
+        return _pack({
+            'type': 'global_model',
+            'global_huis': [[_encode_items(items), utility] for items, utility in global_huis],
+            'num_global_huis': len(global_huis)
+        })
+    
     def run_federated_round(self, round_num: int) -> Dict[str, Any]:
         """Run one round of federated learning."""
         print(f"\n=== Starting Federated Round {round_num} ===")
         
         round_start_time = time.time()
         
+        # Clients keep their connection between rounds; round 1 starts as soon as they upload
+        if round_num > 1:
+            self.start_round(round_num)
+        
         # Wait for all clients to send their local HUIs
         print("Waiting for clients to compute local HUIs...")
         self.wait_for_client_updates()
@@ -178,6 +417,7 @@ class NetworkFederatedServer:
         # Aggregate local HUIs into global model
         print("Aggregating local HUIs into global model...")
         self.aggregate_local_huis()
+        self.push_global_model()
         
         round_end_time = time.time()
         
@@ -190,11 +430,11 @@ class NetworkFederatedServer:
         }
         
         # Collect client statistics
-        for client_id, client_info in self.clients.items():
+        for client_id, client_info in self._client_snapshot():
             if 'local_huis' in client_info:
                 round_result['client_stats'][client_id] = {
                     'num_local_huis': len(client_info['local_huis']),
-                    'total_utility': sum(hui.utility for hui in client_info['local_huis'])
+                    'total_utility': sum(utility for _, utility in client_info['local_huis'])
                 }
         
         self.round_results.append(round_result)
@@ -208,94 +448,105 @@ class NetworkFederatedServer:
     
     def wait_for_client_updates(self, timeout: int = 60):
         """Wait for all clients to send their local HUIs."""
-        start_time = time.time()
-        
-        while time.time() - start_time < timeout:
-            all_updated = True
-            for client_id, client_info in self.clients.items():
-                if 'local_huis' not in client_info:
-                    all_updated = False
-                    break
-            
-            if all_updated:
-                print("All clients have sent their local HUIs")
-                return
-            
-            time.sleep(1)
+        # Set by the handler that stores the last pending upload, so there is no polling delay
+        if self._all_reported.wait(timeout):
+            print("All clients have sent their local HUIs")
+            return
         
         print(f"Timeout waiting for client updates. Proceeding with available clients.")
     
     def aggregate_local_huis(self):
         """Aggregate local HUIs from all clients into global model."""
-        # Simple aggregation: union of all local HUIs above threshold
-        hui_map = {}
+        # Union of all local HUIs, keeping the mean utility across the clients that found each one
+        # The sums are kept up to date as uploads arrive, so only the threshold pass is left
+        with self._clients_lock:
+            num_keys = len(self._agg_keys)
+            sums = self._agg_sums[:num_keys]
+            counts = self._agg_counts[:num_keys]
+            # Keys whose contributors all withdrew keep their slot with a zero count
+            active = counts > 0
+            means = np.divide(sums, counts, out=np.zeros(num_keys), where=active)
+            selected = np.flatnonzero(active & (means >= self.min_utility))
+            global_huis = [(self._agg_keys[i], float(means[i])) for i in selected]
+            num_candidates = int(np.count_nonzero(active))
+        
+        # Pack once here for every client's request, and publish only complete results
+        self._global_model_wire = self._pack_global_model(global_huis)
+        self.global_huis = global_huis
+        
+        print(f"Aggregated {len(self.global_huis)} global HUIs from {num_candidates} candidates")
+    
+    def _uploaders(self) -> List[str]:
+        """Clients whose upload has been acknowledged, i.e. those idle and waiting on the server."""
+        # Anyone else may be mid-RPC and expecting a reply, so server pushes go only to these
+        return [client_id for client_id, info in self._client_snapshot() if info.get('awaiting_push')]
+    
+    def _push(self, client_ids: List[str], payload: bytes, timeout: float = 30.0) -> int:
+        """Send a packed payload to client_ids from the round thread; returns the number reached."""
+        if self.loop is None or not self.loop.is_running():
+            return 0
         
-        for client_id, client_info in self.clients.items():
-            if 'local_huis' not in client_info:
-                continue
-            
-            for hui in client_info['local_huis']:
-                items_key = tuple(sorted(hui.get_items()))
-                
-                if items_key in hui_map:
-                    # Average the utilities
-                    hui_map[items_key]['utility'] = (
-                        hui_map[items_key]['utility'] + hui.utility
-                    ) / 2
-                    hui_map[items_key]['count'] += 1
-                else:
-                    hui_map[items_key] = {
-                        'items': hui.get_items(),
-                        'utility': hui.utility,
-                        'count': 1
-                    }
-        
-        # Create global HUIs from aggregated results
-        self.global_huis = []
-        for items_key, hui_info in hui_map.items():
-            if hui_info['utility'] >= self.min_utility:
-                itemset = Itemset()
-                for item_id in hui_info['items']:
-                    itemset.add_item(Item(item_id, 1))
-                itemset.utility = hui_info['utility']
-                self.global_huis.append(itemset)
-        
-        print(f"Aggregated {len(self.global_huis)} global HUIs from {len(hui_map)} candidates")
-    
-    def send_message(self, client_socket: socket.socket, message: Dict[str, Any]):
-        """Send message to client."""
+        future = asyncio.run_coroutine_threadsafe(self._broadcast(client_ids, payload), self.loop)
         try:
-            serialized = pickle.dumps(message)
-            message_length = len(serialized)
-            
-            # Send message length first
-            client_socket.sendall(message_length.to_bytes(4, byteorder='big'))
-            # Send message
-            client_socket.sendall(serialized)
+            return future.result(timeout)
+        except Exception as e:
+            print(f"Error pushing to clients: {e}")
+            return 0
+    
+    def push_global_model(self, timeout: float = 30.0) -> int:
+        """Send the global model to every client that uploaded HUIs; returns the number reached."""
+        sent = self._push(self._uploaders(), self._global_model_payload(), timeout)
+        print(f"Pushed global model to {sent} clients")
+        return sent
+    
+    def start_round(self, round_num: int) -> int:
+        """Ask the previous round's clients to upload again over their open connections."""
+        with self._clients_lock:
+            recipients = [client_id for client_id, info in self.clients.items() if info.get('awaiting_push')]
+            for client_id in recipients:
+                # Their next message is an upload RPC, so no pushes until it is acknowledged
+                self.clients[client_id]['awaiting_push'] = False
+            if recipients:
+                self._pending_clients.update(recipients)
+                self._all_reported.clear()
+        
+        sent = self._push(recipients, _pack({'type': 'start_round', 'round': round_num}))
+        print(f"Asked {sent} clients to start round {round_num}")
+        return sent
+    
+    def end_session(self) -> int:
+        """Tell the connected clients that no more rounds follow, so they can disconnect."""
+        return self._push(self._uploaders(), _pack({'type': 'session_complete'}))
+    
+    async def _broadcast(self, client_ids: List[str], payload: bytes) -> int:
+        """Write one packed payload to each listed client that is still connected."""
+        frame = _frame(payload)
+        writers = [self._writers[client_id] for client_id in client_ids if client_id in self._writers]
+        # Each write() queues the whole frame on the loop thread, so it can't interleave with a reply
+        for writer in writers:
+            writer.write(frame)
+        results = await asyncio.gather(*(writer.drain() for writer in writers), return_exceptions=True)
+        return sum(1 for result in results if not isinstance(result, Exception))
+    
+    async def send_message(self, writer: asyncio.StreamWriter, message: Dict[str, Any] | bytes):
+        """Send message to client; bytes are taken as an already packed message."""
+        try:
+            payload = message if isinstance(message, bytes) else _pack(message)
+            writer.write(_frame(payload))
+            await writer.drain()
             
         except Exception as e:
             print(f"Error sending message: {e}")
     
-    def receive_message(self, client_socket: socket.socket) -> Optional[Dict[str, Any]]:
+    async def receive_message(self, reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
         """Receive message from client."""
         try:
-            # Receive message length
-            length_bytes = client_socket.recv(4)
-            if not length_bytes:
-                return None
-            
-            message_length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Receive message
-            message_data = b''
-            while len(message_data) < message_length:
-                chunk = client_socket.recv(min(message_length - len(message_data), 4096))
-                if not chunk:
-                    return None
-                message_data += chunk
-            
-            return pickle.loads(message_data)
+            message_length, = _LEN.unpack(await reader.readexactly(_LEN.size))
+            message_data = await reader.readexactly(message_length)
+            return _unpack(message_data)
             
+        except asyncio.IncompleteReadError:
+            return None  # Client closed the connection
         except Exception as e:
             print(f"Error receiving message: {e}")
             return None
@@ -303,8 +554,13 @@ class NetworkFederatedServer:
     def stop_server(self):
         """Stop the federated learning server."""
         self.running = False
-        if self.server_socket:
+        # Called from the round thread as well as the loop's own thread
+        if self.loop is not None and self.loop.is_running():
+            # The asyncio server closes its listening socket as _serve unwinds
+            self.loop.call_soon_threadsafe(self._shutdown.set)
+        elif self.server_socket:
             self.server_socket.close()
+        self.pool.shutdown(wait=False)
         print("Server stopped")
     
     def get_results_summary(self) -> Dict[str, Any]:
@@ -313,14 +569,14 @@ class NetworkFederatedServer:
             'num_rounds': len(self.round_results),
             'num_clients': len(self.clients),
             'num_global_huis': len(self.global_huis),
-            'total_global_utility': sum(hui.utility for hui in self.global_huis),
+            'total_global_utility': sum(utility for _, utility in self.global_huis),
             'round_results': self.round_results,
             'client_info': {
                 client_id: {
                     'data_info': info.get('data_info', {}),
                     'num_local_huis': len(info.get('local_huis', []))
                 }
-                for client_id, info in self.clients.items()
+                for client_id, info in self._client_snapshot()
             }
         }
 
@@ -329,11 +585,16 @@ class NetworkFederatedClient:
     """Federated learning client that connects to a network server."""
     
     def __init__(self, server_host: str, server_port: int = 8888, 
-                 client_name: str = "client", dataset_path: str = ""):
+                 client_name: str = "client", dataset_path: str = "",
+                 sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None,
+                 num_partitions: int = 1):
         self.server_host = server_host
         self.server_port = server_port
         self.client_name = client_name
         self.dataset_path = dataset_path
+        self.sndbuf = sndbuf
+        self.rcvbuf = rcvbuf
+        self.num_partitions = num_partitions  # Worker processes used to mine the local data
         self.client_socket = None
         self.min_utility = 100
         self.local_huis = []
@@ -342,6 +603,8 @@ class NetworkFederatedClient:
         """Connect to the federated learning server."""
         try:
             self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            # Buffer sizes must be set before connect to affect the advertised window
+            _tune_socket(self.client_socket, self.sndbuf, self.rcvbuf)
             self.client_socket.connect((self.server_host, self.server_port))
             
             print(f"Connected to server at {self.server_host}:{self.server_port}")
@@ -385,25 +648,31 @@ class NetworkFederatedClient:
         
         try:
             if self.dataset_path.endswith('.csv'):
-                import pandas as pd
-                df = pd.read_csv(self.dataset_path)
-                
-                # Handle chess dataset format
-                if 'class' in df.columns:
-                    feature_cols = [col for col in df.columns if col != 'class']
-                    for _, row in df.iterrows():
-                        transaction = []
-                        utility = []
-                        for i, col in enumerate(feature_cols):
-                            if pd.notna(row[col]) and row[col] != 0:
-                                transaction.append(i + 1)
-                                utility.append(float(abs(row[col])))
-                        if transaction:
-                            transactions.append(transaction)
-                            utilities.append(utility)
+                # csv.reader instead of pandas: iterrows builds a Series per row
+                with open(self.dataset_path, 'r', newline='', buffering=1 << 20) as f:
+                    reader = csv.reader(f)
+                    header = next(reader, [])
+                    
+                    # Handle chess dataset format
+                    if 'class' in header:
+                        feature_cols = [i for i, name in enumerate(header) if name != 'class']
+                        for row in reader:
+                            transaction = []
+                            utility = []
+                            for item_id, col in enumerate(feature_cols, 1):
+                                cell = row[col].strip() if col < len(row) else ''
+                                if not cell:
+                                    continue  # Missing value
+                                value = float(cell)
+                                if value != 0 and not math.isnan(value):
+                                    transaction.append(item_id)
+                                    utility.append(abs(value))
+                            if transaction:
+                                transactions.append(transaction)
+                                utilities.append(utility)
             else:
                 # Handle text format
-                with open(self.dataset_path, 'r') as f:
+                with open(self.dataset_path, 'r', buffering=1 << 20) as f:
                     for line in f:
                         line = line.strip()
                         if not line:
@@ -437,7 +706,7 @@ class NetworkFederatedClient:
             return False
     
     def compute_local_huis(self) -> bool:
-        """Compute local HUIs using BestEfficientUPGrowth algorithm."""
+        """Compute local HUIs using the OptimizedAlgoUPGrowth algorithm."""
         if not hasattr(self, 'transactions') or not self.transactions:
             print("No local data available")
             return False
@@ -445,31 +714,17 @@ class NetworkFederatedClient:
         print("Computing local HUIs...")
         
         try:
-            # Create temporary dataset file
-            temp_file = f"temp_client_data_{self.client_name}.txt"
-            with open(temp_file, 'w') as f:
-                for trans, utils in zip(self.transactions, self.utilities):
-                    line_parts = []
-                    for item, util in zip(trans, utils):
-                        line_parts.append(f"{item}:{util}")
-                    f.write(" ".join(line_parts) + "\n")
-            
-            # Run BestEfficientUPGrowth algorithm
-            algorithm = BestEfficientUPGrowth()
-            temp_output = f"temp_output_{self.client_name}.txt"
-            
-            algorithm.run_algorithm(temp_file, temp_output, self.min_utility)
-            
-            # Get local HUIs
-            self.local_huis = algorithm.phuis if hasattr(algorithm, 'phuis') else []
+            if self.num_partitions > 1 and len(self.transactions) > 1:
+                self.local_huis = self._compute_partitioned_huis()
+            else:
+                # Mine straight from the loaded lists; no temp file to write, re-parse and delete
+                algorithm = OptimizedAlgoUPGrowth()
+                self.local_huis = algorithm.run_algorithm_memory(
+                    self.transactions, self.utilities, self.min_utility
+                )
             
             print(f"Computed {len(self.local_huis)} local HUIs")
             
-            # Clean up temporary files
-            for temp in [temp_file, temp_output]:
-                if os.path.exists(temp):
-                    os.remove(temp)
-            
             return True
             
         except Exception as e:
@@ -477,6 +732,33 @@ class NetworkFederatedClient:
             traceback.print_exc()
             return False
     
+    def _compute_partitioned_huis(self) -> List[Itemset]:
+        """Mine horizontal partitions of the local data in parallel processes; same HUIs as one pass."""
+        num_parts = min(self.num_partitions, len(self.transactions))
+        bounds = [len(self.transactions) * i // num_parts for i in range(num_parts + 1)]
+        part_transactions = [self.transactions[a:b] for a, b in zip(bounds, bounds[1:])]
+        part_utilities = [self.utilities[a:b] for a, b in zip(bounds, bounds[1:])]
+        
+        start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        with ProcessPoolExecutor(max_workers=num_parts,
+                                 mp_context=multiprocessing.get_context(start_method)) as pool:
+            # A HUI of the whole data reaches min_utility / k in at least one of the k partitions,
+            # so mining each partition at that threshold misses nothing
+            candidates = set()
+            for part_candidates in pool.map(_mine_partition_candidates, part_transactions,
+                                            part_utilities, repeat(self.min_utility / num_parts)):
+                candidates.update(part_candidates)
+            
+            # Partition results are only candidates; sum their exact utilities over every partition
+            totals = defaultdict(float)
+            for part_totals in pool.map(_partition_utilities, part_transactions,
+                                        part_utilities, repeat(sorted(candidates))):
+                for items_key, utility in part_totals.items():
+                    totals[items_key] += utility
+        
+        return [Itemset(list(items_key), utility) for items_key, utility in totals.items()
+                if utility >= self.min_utility]
+    
     def send_local_huis(self) -> bool:
         """Send local HUIs to the server."""
         if not self.local_huis:
@@ -486,12 +768,8 @@ class NetworkFederatedClient:
         print(f"Sending {len(self.local_huis)} local HUIs to server...")
         
         # Convert HUIs to serializable format
-        huis_data = []
-        for hui in self.local_huis:
-            huis_data.append({
-                'items': hui.get_items(),
-                'utility': hui.utility
-            })
+        # Sorted here once so the server can key on the items without sorting them again
+        huis_data = [[_encode_items(sorted(hui.get_items())), hui.utility] for hui in self.local_huis]
         
         message = {
             'type': 'local_huis',
@@ -525,40 +803,41 @@ class NetworkFederatedClient:
         
         try:
             self.send_message(message)
-            response = self.receive_message()
-            
-            if response and response.get('type') == 'global_model':
-                global_huis_data = response.get('global_huis', [])
-                
-                # Convert back to Itemset objects
-                global_huis = []
-                for hui_data in global_huis_data:
-                    itemset = Itemset()
-                    for item_id in hui_data['items']:
-                        itemset.add_item(Item(item_id, 1))
-                    itemset.utility = hui_data['utility']
-                    global_huis.append(itemset)
-                
-                print(f"Received global model with {len(global_huis)} HUIs")
-                return global_huis
-            else:
-                print(f"Failed to get global model: {response}")
-                return []
+            return self._decode_global_model(self.receive_message())
                 
         except Exception as e:
             print(f"Error requesting global model: {e}")
             return []
     
+    def receive_global_model(self) -> List[Itemset]:
+        """Wait for the global model the server pushes after aggregating the round."""
+        print("Waiting for global model from server...")
+        
+        try:
+            return self._decode_global_model(self.receive_message())
+        
+        except Exception as e:
+            print(f"Error receiving global model: {e}")
+            return []
+    
+    def _decode_global_model(self, response: Optional[Dict[str, Any]]) -> List[Itemset]:
+        """Turn a 'global_model' message into Itemset objects."""
+        if response and response.get('type') == 'global_model':
+            global_huis_data = response.get('global_huis', [])
+            
+            # Convert back to Itemset objects
+            global_huis = [Itemset(_decode_items(deltas), utility) for deltas, utility in global_huis_data]
+            
+            print(f"Received global model with {len(global_huis)} HUIs")
+            return global_huis
+        
+        print(f"Failed to get global model: {response}")
+        return []
+    
     def send_message(self, message: Dict[str, Any]):
         """Send message to server."""
         try:
-            serialized = pickle.dumps(message)
-            message_length = len(serialized)
-            
-            # Send message length first
-            self.client_socket.sendall(message_length.to_bytes(4, byteorder='big'))
-            # Send message
-            self.client_socket.sendall(serialized)
+            _send_frame(self.client_socket, _pack(message))
             
         except Exception as e:
             print(f"Error sending message: {e}")
@@ -566,22 +845,11 @@ class NetworkFederatedClient:
     def receive_message(self) -> Optional[Dict[str, Any]]:
         """Receive message from server."""
         try:
-            # Receive message length
-            length_bytes = self.client_socket.recv(4)
-            if not length_bytes:
+            message_data = _recv_frame(self.client_socket)
+            if message_data is None:
                 return None
             
-            message_length = int.from_bytes(length_bytes, byteorder='big')
-            
-            # Receive message
-            message_data = b''
-            while len(message_data) < message_length:
-                chunk = self.client_socket.recv(min(message_length - len(message_data), 4096))
-                if not chunk:
-                    return None
-                message_data += chunk
-            
-            return pickle.loads(message_data)
+            return _unpack(message_data)
             
         except Exception as e:
             print(f"Error receiving message: {e}")
@@ -611,31 +879,38 @@ class NetworkFederatedClient:
             self.disconnect()
             return False
         
-        # Send local HUIs to server
-        if not self.send_local_huis():
-            self.disconnect()
-            return False
-        
-        # Wait a bit for server to aggregate
-        time.sleep(2)
-        
-        # Request global model
-        global_huis = self.request_global_model()
+        # One connection for every round; the server says when the next one starts
+        round_num = 1
+        while True:
+            # Send local HUIs to server
+            if not self.send_local_huis():
+                self.disconnect()
+                return False
+            
+            # The server pushes the global model once it has aggregated the round
+            global_huis = self.receive_global_model()
+            print(f"Round {round_num} done. Local HUIs: {len(self.local_huis)}, Global HUIs: {len(global_huis)}")
+            
+            message = self.receive_message()
+            if not message or message.get('type') != 'start_round':
+                break
+            # The local data has not changed, so the HUIs mined above are still current
+            round_num = message.get('round', round_num + 1)
         
-        print(f"Client session completed. Local HUIs: {len(self.local_huis)}, Global HUIs: {len(global_huis)}")
+        print(f"Client session completed after {round_num} rounds. Local HUIs: {len(self.local_huis)}, Global HUIs: {len(global_huis)}")
         
         self.disconnect()
         return True
 
 
 def run_server(host: str = '0.0.0.0', port: int = 8888, min_utility: int = 100, 
-               num_rounds: int = 3):
+               num_rounds: int = 3, sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None):
     """Run federated learning server."""
     print("="*60)
     print("FEDERATED LEARNING SERVER")
     print("="*60)
     
-    server = NetworkFederatedServer(host, port, min_utility)
+    server = NetworkFederatedServer(host, port, min_utility, sndbuf, rcvbuf)
     
     try:
         # Start server in separate thread
@@ -655,6 +930,8 @@ def run_server(host: str = '0.0.0.0', port: int = 8888, min_utility: int = 100,
                 print(f"Waiting 10 seconds before next round...")
                 time.sleep(10)
         
+        server.end_session()
+        
         # Print final results
         results = server.get_results_summary()
         print("\n" + "="*60)
@@ -678,13 +955,16 @@ def run_server(host: str = '0.0.0.0', port: int = 8888, min_utility: int = 100,
 
 
 def run_client(server_host: str, server_port: int = 8888, 
-               client_name: str = "client", dataset_path: str = ""):
+               client_name: str = "client", dataset_path: str = "",
+               sndbuf: Optional[int] = None, rcvbuf: Optional[int] = None,
+               num_partitions: int = 1):
     """Run federated learning client."""
     print("="*60)
     print(f"FEDERATED LEARNING CLIENT: {client_name}")
     print("="*60)
     
-    client = NetworkFederatedClient(server_host, server_port, client_name, dataset_path)
+    client = NetworkFederatedClient(server_host, server_port, client_name, dataset_path,
+                                    sndbuf, rcvbuf, num_partitions)
     
     try:
         success = client.run_client_session()
@@ -715,18 +995,25 @@ def main():
                        help='Client name (client only)')
     parser.add_argument('--dataset', default='chess_data.csv', 
                        help='Dataset path (client only)')
+    parser.add_argument('--sndbuf', type=int, default=None,
+                       help='Socket send buffer in bytes (default: kernel autotuning)')
+    parser.add_argument('--rcvbuf', type=int, default=None,
+                       help='Socket receive buffer in bytes (default: kernel autotuning)')
+    parser.add_argument('--partitions', type=int, default=1,
+                       help='Mine the local dataset in this many parallel processes (client only, default: 1)')
     
     args = parser.parse_args()
     
     if args.mode == 'server':
-        run_server(args.host, args.port, args.min_utility, args.rounds)
+        run_server(args.host, args.port, args.min_utility, args.rounds, args.sndbuf, args.rcvbuf)
     else:
         # For client mode, resolve dataset path
         dataset_path = os.path.join(
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
             args.dataset
         )
-        run_client(args.host, args.port, args.client_name, dataset_path)
+        run_client(args.host, args.port, args.client_name, dataset_path, args.sndbuf, args.rcvbuf,
+                   args.partitions)
 
 
 if __name__ == "__main__":
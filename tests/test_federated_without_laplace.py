@@ -12,125 +12,179 @@ Copyright (c) 2024 - Federated FP-Growth Testing (No DP)
 
 import time
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Callable
 import os
 import json
 from datetime import datetime
 import psutil
 import sys
 import traceback
+import tracemalloc
+import mmap
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from operator import attrgetter, methodcaller
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from federated_fp_growth import FederatedFPGrowth, FederatedClient
+from federated_fp_growth import FederatedFPGrowth, FederatedClient, _MP_CONTEXT
 from Alogrithm import OptimizedAlgoUPGrowth
-from itemset import Itemset
+from itemset import Itemset, utility_totals
 from item import Item
+from dataset_utils import DatasetCacheMixin, parse_item_utility_line
+
+
+def _iter_byte_lines(path: str):
+    """Yield a file's lines as bytes from a read-only memory map of it."""
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:  # mmap rejects empty files
+            return
+        # Lines come straight from the page cache, without a whole-file read buffer
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from iter(mm.readline, b'')
+
+
+def _traced_peak_mb(run: Callable[[], Any]) -> Optional[float]:
+    """Peak traced Python allocation in MB of one extra call of `run`.
+
+    This pass is separate from the timed one, so tracemalloc's allocation
+    hooks never count towards a reported runtime. Returns None when an outer
+    trace is already active, because resetting its peak would corrupt it.
+    """
+    if tracemalloc.is_tracing():
+        return None
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def _summarize_scalability_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Reduce a federated run result to the fields reported per client count."""
+    stats = result.get('client_statistics', [])
+    counts = np.fromiter((client['num_local_huis'] for client in stats),
+                         dtype=np.int32, count=len(stats))
+    return {
+        'num_huis': result.get('num_global_huis', 0),
+        'runtime_seconds': result.get('runtime_seconds', 0),
+        'memory_usage_mb': result.get('memory_usage_mb', 0),
+        'communication_cost_mb': result.get('communication_cost_mb', 0),
+        'avg_client_huis': float(counts.mean()) if counts.size else 0.0
+    }
+
+
+_hui_items = methodcaller('get_items')
+_hui_utility = attrgetter('utility')
+
+
+def _hui_details(huis: List[Itemset], limit: int = 10) -> List[Dict[str, Any]]:
+    """Items and utility of the first `limit` HUIs, read through C-level accessors."""
+    top = huis[:limit]
+    return [{'items': items, 'utility': utility}
+            for items, utility in zip(map(_hui_items, top), map(_hui_utility, top))]
 
 
-class FederatedTestWithoutLaplace:
+def _run_scalability_trial(results_dir: str, dataset_path: str, parsed_dataset: Tuple[List, List],
+                           min_utility: int, num_clients: int) -> Dict[str, Any]:
+    """Run one scalability configuration in a worker process."""
+    tester = FederatedTestWithoutLaplace(results_dir)
+    tester.dataset_cache[dataset_path] = parsed_dataset
+    result = tester.run_federated_without_laplace(
+        dataset_path, min_utility, num_clients, num_rounds=2, iid=True
+    )
+    # Summarize in the worker so only a few numbers are pickled back
+    return _summarize_scalability_result(result)
+
+
+class FederatedTestWithoutLaplace(DatasetCacheMixin):
     """Comprehensive tester for federated learning HUIM experiments without Laplace DP."""
     
-    def __init__(self, results_dir: str = "results/chapter_four/federated_no_laplace"):
+    def __init__(self, results_dir: str = "results/chapter_four/federated_no_laplace",
+                 measure_memory: bool = False):
         self.results_dir = results_dir
+        # Re-run each measured block under tracemalloc for a Python peak; doubles the mining cost
+        self.measure_memory = measure_memory
         os.makedirs(results_dir, exist_ok=True)
         self.test_results = {}
+        self._init_dataset_caches()
         self.performance_metrics = {}
+        self._proc = psutil.Process()  # Reused for every RSS sample
+        
+    def parse_dataset(self, dataset_path: str) -> Tuple[List[List[int]], List[List[float]]]:
+        """Parse a dataset into transactions and utilities, reusing a cached parse if present."""
+        cached = self.dataset_cache.get(dataset_path)
+        if cached is not None:
+            return cached
         
-    def load_and_split_dataset(self, dataset_path: str, num_clients: int = 5, 
-                              iid: bool = True) -> Tuple[List[List[List[int]]], List[List[List[float]]]]:
-        """Load dataset and split among clients (IID or non-IID)."""
         print(f"Loading dataset: {dataset_path}")
         
         transactions = []
         utilities = []
         
         try:
+            # Bytes lines skip decoding, and int()/float() accept them directly
+            lines = _iter_byte_lines(dataset_path)
+            
             if dataset_path.endswith('.csv'):
                 # Handle chess dataset format: "item1 item2 item3:utility"
-                with open(dataset_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    if b':' in line:
+                        # Split by colon to separate items and utility
+                        items_part, utility_part = line.rsplit(b':', 1)
+                        items = list(map(int, items_part.split()))
+                        total_utility = float(utility_part)
                         
-                        if ':' in line:
-                            # Split by colon to separate items and utility
-                            items_part, utility_part = line.rsplit(':', 1)
-                            items = [int(x) for x in items_part.split()]
-                            total_utility = float(utility_part)
-                            
-                            if items:
-                                transactions.append(items)
-                                # Distribute utility equally among items
-                                item_utility = total_utility / len(items)
-                                utilities.append([item_utility] * len(items))
-                        else:
-                            # No utility specified, use default
-                            items = [int(x) for x in line.split()]
-                            if items:
-                                transactions.append(items)
-                                utilities.append([1.0] * len(items))
+                        if items:
+                            transactions.append(items)
+                            # Distribute utility equally among items
+                            item_utility = total_utility / len(items)
+                            utilities.append([item_utility] * len(items))
+                    else:
+                        # No utility specified, use default
+                        items = list(map(int, line.split()))
+                        if items:
+                            transactions.append(items)
+                            utilities.append([1.0] * len(items))
             else:
                 # Handle text format (mushroom, transactional)
-                with open(dataset_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        if ':' in line:  # Format: item1:utility1 item2:utility2
-                            parts = line.split()
-                            transaction = []
-                            utility = []
-                            for part in parts:
-                                if ':' in part:
-                                    item, util = part.split(':')
-                                    transaction.append(int(item))
-                                    utility.append(float(util))
-                            if transaction:
-                                transactions.append(transaction)
-                                utilities.append(utility)
-                        else:  # Simple format: item1 item2 item3
-                            items = [int(x) for x in line.split()]
-                            if items:
-                                transactions.append(items)
-                                utilities.append([1.0] * len(items))  # Default utility
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    if b':' in line:  # Format: item1:utility1 item2:utility2
+                        items, utils = parse_item_utility_line(line)
+                        if items:
+                            transactions.append(items)
+                            utilities.append(utils)
+                    else:  # Simple format: item1 item2 item3
+                        items = list(map(int, line.split()))
+                        if items:
+                            transactions.append(items)
+                            utilities.append([1.0] * len(items))  # Default utility
                                 
         except Exception as e:
             print(f"Error loading dataset {dataset_path}: {e}")
             return [], []
         
         print(f"Loaded {len(transactions)} transactions")
-        
-        # Split data among clients
-        client_transactions = [[] for _ in range(num_clients)]
-        client_utilities = [[] for _ in range(num_clients)]
-        
-        if iid:
-            # IID distribution - random assignment
-            for i, (trans, util) in enumerate(zip(transactions, utilities)):
-                client_idx = i % num_clients
-                client_transactions[client_idx].append(trans)
-                client_utilities[client_idx].append(util)
-        else:
-            # Non-IID distribution - sort by transaction length and distribute
-            sorted_data = sorted(zip(transactions, utilities), key=lambda x: len(x[0]))
-            chunk_size = len(sorted_data) // num_clients
-            
-            for i in range(num_clients):
-                start_idx = i * chunk_size
-                end_idx = start_idx + chunk_size if i < num_clients - 1 else len(sorted_data)
-                
-                for j in range(start_idx, end_idx):
-                    client_transactions[i].append(sorted_data[j][0])
-                    client_utilities[i].append(sorted_data[j][1])
-        
-        return client_transactions, client_utilities
+        self.dataset_cache[dataset_path] = (transactions, utilities)
+        return transactions, utilities
+    
+    def _peak_memory_mb(self, run: Callable[[], Any]) -> Optional[float]:
+        """Traced peak of an extra run of `run` when measure_memory is on, else None."""
+        return _traced_peak_mb(run) if self.measure_memory else None
     
     def run_centralized_baseline(self, dataset_path: str, min_utility: int) -> Dict[str, Any]:
         """Run centralized BestEfficientUPGrowth as baseline."""
@@ -141,36 +195,41 @@ class FederatedTestWithoutLaplace:
         algorithm = OptimizedAlgoUPGrowth()
         
         start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
         
         try:
-            # Create temporary output file
-            temp_output = os.path.join(self.results_dir, "temp_centralized_output.txt")
-            algorithm.run_algorithm(dataset_path, temp_output, min_utility)
-            
-            end_time = time.time()
-            end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+            # HUIs are read back from algorithm.phuis, so skip writing an output file
+            try:
+                algorithm.run_algorithm(dataset_path, None, min_utility)
+            finally:
+                end_time = time.time()
             
             # Get results
             huis = algorithm.phuis if hasattr(algorithm, 'phuis') else []
+            total_utility, avg_utility = utility_totals(huis)
+            
+            # With measure_memory, a second traced run on a fresh instance; otherwise the RSS high-water mark
+            peak_memory = self._peak_memory_mb(
+                lambda: OptimizedAlgoUPGrowth().run_algorithm(dataset_path, None, min_utility)
+            )
+            memory_source = 'tracemalloc'
+            if peak_memory is None:
+                peak_memory, memory_source = algorithm.max_memory, 'rss'
             
             results = {
                 'algorithm': 'Centralized BestEfficientUPGrowth',
                 'dataset': os.path.basename(dataset_path),
                 'min_utility': min_utility,
                 'num_huis': len(huis),
-                'total_utility': sum(hui.utility for hui in huis) if huis else 0,
-                'avg_utility': sum(hui.utility for hui in huis) / len(huis) if huis else 0,
+                'total_utility': total_utility,
+                'avg_utility': avg_utility,
                 'runtime_seconds': end_time - start_time,
-                'memory_usage_mb': end_memory - start_memory,
+                'memory_usage_mb': peak_memory,
+                'memory_source': memory_source,
+                'rss_mb': self._proc.memory_info().rss / 1024 / 1024,
                 'max_memory_mb': algorithm.max_memory if hasattr(algorithm, 'max_memory') else 0,
-                'hui_details': [{'items': hui.get_items(), 'utility': hui.utility} for hui in huis[:10]]  # First 10 HUIs
+                'hui_details': _hui_details(huis)  # First 10 HUIs
             }
             
-            # Clean up
-            if os.path.exists(temp_output):
-                os.remove(temp_output)
-                
             return results
             
         except Exception as e:
@@ -188,7 +247,7 @@ class FederatedTestWithoutLaplace:
     
     def run_federated_without_laplace(self, dataset_path: str, min_utility: int, 
                                     num_clients: int = 5, num_rounds: int = 3,
-                                    iid: bool = True) -> Dict[str, Any]:
+                                    iid: bool = True, parallel_clients: bool = False) -> Dict[str, Any]:
         """Run federated FP-Growth without Laplace DP."""
         print(f"\n=== Running Federated FP-Growth (No Laplace DP) ===")
         print(f"Dataset: {dataset_path}")
@@ -207,35 +266,50 @@ class FederatedTestWithoutLaplace:
                 'runtime_seconds': 0
             }
         
-        # Initialize federated system
-        federated_system = FederatedFPGrowth(
-            min_utility=min_utility,
-            use_laplace_dp=False  # No Laplace DP
-        )
-        
-        # Create clients and add them to the federated system
-        for i in range(num_clients):
-            if client_transactions[i]:  # Only create client if it has data
-                client = FederatedClient(
-                    client_id=i,
-                    transactions=client_transactions[i],
-                    utilities=client_utilities[i],
-                    min_utility=min_utility
-                )
-                federated_system.add_client(client)
+        def build_system() -> FederatedFPGrowth:
+            # Initialize federated system
+            system = FederatedFPGrowth(
+                min_utility=min_utility,
+                use_laplace_dp=False,  # No Laplace DP
+                parallel_clients=parallel_clients
+            )
+            
+            # Create clients and add them to the federated system
+            for i in range(num_clients):
+                if client_transactions[i]:  # Only create client if it has data
+                    client = FederatedClient(
+                        client_id=i,
+                        transactions=client_transactions[i],
+                        utilities=client_utilities[i],
+                        min_utility=min_utility
+                    )
+                    system.add_client(client)
+            
+            # Set number of rounds
+            system.num_rounds = num_rounds
+            return system
         
-        # Set number of rounds
-        federated_system.num_rounds = num_rounds
+        federated_system = build_system()
         
         start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
         
         try:
             # Run federated learning
-            global_huis = federated_system.run_federated_learning()
+            try:
+                global_huis = federated_system.run_federated_learning()
+            finally:
+                end_time = time.time()
             
-            end_time = time.time()
-            end_memory = psutil.Process().memory_info().rss / 1024 / 1024  # MB
+            # Worker processes are invisible to the parent's tracemalloc, so the process
+            # path, like an unmeasured run, reports the largest client-measured RSS instead
+            peak_memory = None
+            if not parallel_clients:
+                peak_memory = self._peak_memory_mb(lambda: build_system().run_federated_learning())
+            memory_source = 'tracemalloc'
+            if peak_memory is None:
+                peak_memory = max((client.local_max_memory for client in federated_system.clients),
+                                  default=0.0)
+                memory_source = 'worker_rss' if parallel_clients else 'rss'
             
             # Get performance metrics
             performance_metrics = federated_system.get_performance_metrics()
@@ -244,14 +318,14 @@ class FederatedTestWithoutLaplace:
             total_communication = sum(federated_system.communication_costs)
             
             # Client statistics
-            client_stats = []
-            for client in federated_system.clients:
-                client_stats.append({
-                    'client_id': client.client_id,
-                    'num_transactions': len(client.transactions),
-                    'num_local_huis': len(client.local_huis),
-                    'local_total_utility': sum(hui.utility for hui in client.local_huis) if client.local_huis else 0
-                })
+            client_stats = [{
+                'client_id': client.client_id,
+                'num_transactions': len(client.transactions),
+                'num_local_huis': len(client.local_huis),
+                'local_total_utility': client.local_total_utility
+            } for client in federated_system.clients]
+            
+            total_utility, avg_utility = utility_totals(global_huis)
             
             results = {
                 'algorithm': 'Federated FP-Growth (No Laplace DP)',
@@ -261,14 +335,16 @@ class FederatedTestWithoutLaplace:
                 'num_rounds': num_rounds,
                 'iid_distribution': iid,
                 'num_global_huis': len(global_huis),
-                'total_utility': sum(hui.utility for hui in global_huis) if global_huis else 0,
-                'avg_utility': sum(hui.utility for hui in global_huis) / len(global_huis) if global_huis else 0,
+                'total_utility': total_utility,
+                'avg_utility': avg_utility,
                 'runtime_seconds': end_time - start_time,
-                'memory_usage_mb': end_memory - start_memory,
+                'memory_usage_mb': peak_memory,
+                'memory_source': memory_source,
+                'rss_mb': self._proc.memory_info().rss / 1024 / 1024,
                 'communication_cost_mb': total_communication / (1024 * 1024),  # Convert to MB
                 'client_statistics': client_stats,
                 'round_results': federated_system.round_times,
-                'hui_details': [{'items': hui.items, 'utility': hui.utility} for hui in global_huis[:10]]
+                'hui_details': _hui_details(global_huis)
             }
             
             return results
@@ -292,45 +368,38 @@ class FederatedTestWithoutLaplace:
         
         results = {}
         
-        # Test with pseudo-projection enabled
-        algorithm_with_pp = OptimizedAlgoUPGrowth()
-        algorithm_with_pp.use_pseudo_projection = True
-        
-        start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024
+        # One instance for both arms: the file is read once and mining state reset in between
+        algorithm = OptimizedAlgoUPGrowth()
+        algorithm.preload(dataset_path)
         
-        temp_output_pp = os.path.join(self.results_dir, "temp_pp_output.txt")
-        algorithm_with_pp.run_algorithm(dataset_path, temp_output_pp, min_utility)
+        def run_arm() -> None:
+            algorithm.reset_mining_state()
+            algorithm.run_algorithm(dataset_path, None, min_utility)
         
-        end_time = time.time()
-        end_memory = psutil.Process().memory_info().rss / 1024 / 1024
+        def measure_arm(use_pseudo_projection: bool) -> Dict[str, Any]:
+            algorithm.use_pseudo_projection = use_pseudo_projection
+            # Any traced pass runs first so the timed run below leaves its HUIs and counters in place
+            peak_memory = self._peak_memory_mb(run_arm)
+            start_time = time.time()
+            try:
+                run_arm()
+            finally:
+                end_time = time.time()
+            return {
+                'num_huis': len(algorithm.phuis),
+                'runtime_seconds': end_time - start_time,
+                'memory_usage_mb': peak_memory if peak_memory is not None else algorithm.max_memory,
+                'memory_source': 'tracemalloc' if peak_memory is not None else 'rss'
+            }
         
-        results['with_pseudo_projection'] = {
-            'num_huis': len(algorithm_with_pp.phuis) if hasattr(algorithm_with_pp, 'phuis') else 0,
-            'runtime_seconds': end_time - start_time,
-            'memory_usage_mb': end_memory - start_memory,
-            'cache_hits': algorithm_with_pp.cache_hits if hasattr(algorithm_with_pp, 'cache_hits') else 0,
-            'cache_misses': algorithm_with_pp.cache_misses if hasattr(algorithm_with_pp, 'cache_misses') else 0
-        }
+        # Test with pseudo-projection enabled
+        results['with_pseudo_projection'] = measure_arm(True)
+        results['with_pseudo_projection'].update(
+            cache_hits=algorithm.cache_hits, cache_misses=algorithm.cache_misses
+        )
         
         # Test without pseudo-projection
-        algorithm_without_pp = OptimizedAlgoUPGrowth()
-        algorithm_without_pp.use_pseudo_projection = False
-        
-        start_time = time.time()
-        start_memory = psutil.Process().memory_info().rss / 1024 / 1024
-        
-        temp_output_no_pp = os.path.join(self.results_dir, "temp_no_pp_output.txt")
-        algorithm_without_pp.run_algorithm(dataset_path, temp_output_no_pp, min_utility)
-        
-        end_time = time.time()
-        end_memory = psutil.Process().memory_info().rss / 1024 / 1024
-        
-        results['without_pseudo_projection'] = {
-            'num_huis': len(algorithm_without_pp.phuis) if hasattr(algorithm_without_pp, 'phuis') else 0,
-            'runtime_seconds': end_time - start_time,
-            'memory_usage_mb': end_memory - start_memory
-        }
+        results['without_pseudo_projection'] = measure_arm(False)
         
         # Calculate improvements
         if results['without_pseudo_projection']['runtime_seconds'] > 0:
@@ -360,38 +429,48 @@ class FederatedTestWithoutLaplace:
             )
         }
         
-        # Clean up
-        for temp_file in [temp_output_pp, temp_output_no_pp]:
-            if os.path.exists(temp_file):
-                os.remove(temp_file)
-        
         return results
     
-    def run_scalability_test(self, dataset_path: str, min_utility: int) -> Dict[str, Any]:
+    def run_scalability_test(self, dataset_path: str, min_utility: int,
+                             parallel: bool = True) -> Dict[str, Any]:
         """Test scalability with different numbers of clients."""
         print(f"\n=== Running Scalability Test ===")
         
         client_counts = [2, 3, 5, 8, 10]
         scalability_results = {}
         
-        for num_clients in client_counts:
-            print(f"Testing with {num_clients} clients...")
-            
-            result = self.run_federated_without_laplace(
-                dataset_path, min_utility, num_clients, num_rounds=2, iid=True
-            )
+        if not parallel:
+            for num_clients in client_counts:
+                print(f"Testing with {num_clients} clients...")
+                
+                result = self.run_federated_without_laplace(
+                    dataset_path, min_utility, num_clients, num_rounds=2, iid=True
+                )
+                scalability_results[num_clients] = _summarize_scalability_result(result)
             
-            scalability_results[num_clients] = {
-                'num_huis': result.get('num_global_huis', 0),
-                'runtime_seconds': result.get('runtime_seconds', 0),
-                'memory_usage_mb': result.get('memory_usage_mb', 0),
-                'communication_cost_mb': result.get('communication_cost_mb', 0),
-                'avg_client_huis': np.mean([
-                    client['num_local_huis'] for client in result.get('client_statistics', [])
-                ]) if result.get('client_statistics') else 0
+            return scalability_results
+        
+        # Client counts are independent runs over the same parse; each worker's RSS is its own
+        parsed_dataset = self.parse_dataset(dataset_path)
+        max_workers = min(len(client_counts), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT) as executor:
+            future_to_clients = {
+                executor.submit(_run_scalability_trial, self.results_dir, dataset_path,
+                                parsed_dataset, min_utility, num_clients): num_clients
+                for num_clients in client_counts
             }
-        
-        return scalability_results
+            
+            for future in as_completed(future_to_clients):
+                num_clients = future_to_clients[future]
+                try:
+                    scalability_results[num_clients] = future.result()
+                    print(f"{num_clients} clients done")
+                except Exception as e:
+                    print(f"{num_clients} clients failed: {e}")
+                    scalability_results[num_clients] = {'error': str(e)}
+        
+        # Report in client-count order so the scalability plot stays monotone in x
+        return {num_clients: scalability_results[num_clients] for num_clients in client_counts}
     
     def generate_comprehensive_report(self, test_results: Dict[str, Any], 
                                     output_file: str = "federated_no_laplace_report.json"):
@@ -408,33 +487,42 @@ class FederatedTestWithoutLaplace:
         
         # Save report
         report_path = os.path.join(self.results_dir, output_file)
-        with open(report_path, 'w') as f:
-            json.dump(report, f, indent=2, default=str)
+        if orjson is not None:
+            # Scalability results are keyed by client count, hence OPT_NON_STR_KEYS
+            options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            with open(report_path, 'wb') as f:
+                f.write(orjson.dumps(report, default=str, option=options))
+        else:
+            with open(report_path, 'w') as f:
+                json.dump(report, f, indent=2, default=str)
         
         print(f"\nReport saved to: {report_path}")
         return report
     
     def create_performance_visualizations(self, test_results: Dict[str, Any]):
         """Create performance visualization charts."""
+        # Only this method plots, so test runs that stop before it never load matplotlib
+        import matplotlib
+        matplotlib.use('Agg')  # Plots are only saved to disk; skip GUI backend setup
+        import matplotlib.pyplot as plt
+        
         plt.style.use('seaborn-v0_8')
         fig, axes = plt.subplots(2, 2, figsize=(15, 12))
         
-        # Extract data for visualization
-        datasets = []
-        centralized_times = []
-        federated_times = []
-        centralized_huis = []
-        federated_huis = []
-        
-        for test_name, result in test_results.items():
-            if isinstance(result, dict) and 'centralized' in result and 'federated' in result:
-                datasets.append(result['centralized'].get('dataset', test_name))
-                centralized_times.append(result['centralized'].get('runtime_seconds', 0))
-                federated_times.append(result['federated'].get('runtime_seconds', 0))
-                centralized_huis.append(result['centralized'].get('num_huis', 0))
-                federated_huis.append(result['federated'].get('num_global_huis', 0))
-        
-        if datasets:
+        # Extract data for visualization: one row per configuration, unzipped into columns
+        rows = [
+            (result['centralized'].get('dataset', test_name),
+             result['centralized'].get('runtime_seconds', 0),
+             result['federated'].get('runtime_seconds', 0),
+             result['centralized'].get('num_huis', 0),
+             result['federated'].get('num_global_huis', 0))
+            for test_name, result in test_results.items()
+            if isinstance(result, dict) and 'centralized' in result and 'federated' in result
+        ]
+        
+        if rows:
+            datasets, centralized_times, federated_times, centralized_huis, federated_huis = zip(*rows)
+            
             # Runtime comparison
             x = np.arange(len(datasets))
             width = 0.35
@@ -459,11 +547,8 @@ class FederatedTestWithoutLaplace:
             axes[0, 1].legend()
         
         # Scalability plot (if available)
-        scalability_data = None
-        for result in test_results.values():
-            if isinstance(result, dict) and 'scalability' in result:
-                scalability_data = result['scalability']
-                break
+        scalability_data = next((result['scalability'] for result in test_results.values()
+                                 if isinstance(result, dict) and 'scalability' in result), None)
         
         if scalability_data:
             clients = list(scalability_data.keys())
@@ -476,11 +561,8 @@ class FederatedTestWithoutLaplace:
             axes[1, 0].grid(True, alpha=0.3)
         
         # Pseudo-projection effectiveness (if available)
-        pp_data = None
-        for result in test_results.values():
-            if isinstance(result, dict) and 'pseudo_projection' in result:
-                pp_data = result['pseudo_projection']
-                break
+        pp_data = next((result['pseudo_projection'] for result in test_results.values()
+                        if isinstance(result, dict) and 'pseudo_projection' in result), None)
         
         if pp_data and 'improvements' in pp_data:
             improvements = pp_data['improvements']
@@ -507,6 +589,74 @@ class FederatedTestWithoutLaplace:
         print(f"Performance visualizations saved to: {plot_path}")
 
 
+def _run_single_config(tester: FederatedTestWithoutLaplace, dataset_path: str, min_utility: int,
+                       run_scalability: bool) -> Dict[str, Any]:
+    """Run every no-DP test for one (dataset, min_utility) configuration."""
+    test_key = f"{os.path.basename(dataset_path)}_{min_utility}"
+    
+    try:
+        # Run centralized baseline
+        centralized_result = tester.run_centralized_baseline(dataset_path, min_utility)
+        
+        # Run federated without Laplace DP
+        federated_result = tester.run_federated_without_laplace(
+            dataset_path, min_utility, num_clients=5, num_rounds=3, iid=True
+        )
+        
+        # Test pseudo-projection effectiveness
+        pp_result = tester.test_pseudo_projection_effectiveness(dataset_path, min_utility)
+        
+        scalability_result = None
+        if run_scalability:
+            # The grid pool already uses every core, so client counts run in-process
+            scalability_result = tester.run_scalability_test(dataset_path, min_utility, parallel=False)
+        
+        # Print summary
+        print(f"\n--- Results Summary for {test_key} ---")
+        print(f"Centralized HUIs: {centralized_result.get('num_huis', 0)}")
+        print(f"Federated HUIs: {federated_result.get('num_global_huis', 0)}")
+        print(f"Centralized Runtime: {centralized_result.get('runtime_seconds', 0):.2f}s")
+        print(f"Federated Runtime: {federated_result.get('runtime_seconds', 0):.2f}s")
+        
+        if pp_result and 'improvements' in pp_result:
+            improvements = pp_result['improvements']
+            print(f"Pseudo-projection Runtime Improvement: {improvements.get('runtime_improvement_percent', 0):.1f}%")
+            print(f"Pseudo-projection Memory Improvement: {improvements.get('memory_improvement_percent', 0):.1f}%")
+        
+        return {
+            'centralized': centralized_result,
+            'federated': federated_result,
+            'pseudo_projection': pp_result,
+            'scalability': scalability_result
+        }
+        
+    except Exception as e:
+        print(f"Error testing {test_key}: {e}")
+        traceback.print_exc()
+        return {'error': str(e)}
+
+
+def _run_dataset(results_dir: str, dataset_name: str, dataset_path: str,
+                 min_utilities: List[int]) -> Dict[str, Dict[str, Any]]:
+    """Run every threshold of one dataset in a worker process on one tester.
+
+    Sharing the tester lets later thresholds reuse the parsed dataset and
+    client splits of the first.
+    """
+    print(f"\n{'='*60}")
+    print(f"Testing Dataset: {dataset_name}")
+    print(f"{'='*60}")
+    
+    tester = FederatedTestWithoutLaplace(results_dir)
+    # Scalability only runs for the first min_utility to save time
+    return {
+        f"{dataset_name}_{min_utility}": _run_single_config(
+            tester, dataset_path, min_utility, min_utility == min_utilities[0]
+        )
+        for min_utility in min_utilities
+    }
+
+
 def main():
     """Main function to run all federated learning tests without Laplace DP."""
     print("=== Federated FP-Growth Testing Suite (No Laplace DP) ===")
@@ -523,6 +673,7 @@ def main():
     ]
     
     all_results = {}
+    jobs = []
     
     for dataset_name, min_utilities in datasets:
         dataset_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), dataset_name)
@@ -531,53 +682,35 @@ def main():
             print(f"Dataset not found: {dataset_path}")
             continue
         
-        print(f"\n{'='*60}")
-        print(f"Testing Dataset: {dataset_name}")
-        print(f"{'='*60}")
-        
-        for min_utility in min_utilities:
-            test_key = f"{dataset_name}_{min_utility}"
+        jobs.append((dataset_name, dataset_path, min_utilities))
+    
+    # Datasets are independent CPU-bound mining, so use processes; each job
+    # runs its thresholds in order on one tester so the dataset is parsed once
+    if jobs:
+        collected = {}
+        max_workers = min(len(jobs), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=_MP_CONTEXT) as executor:
+            future_to_job = {
+                executor.submit(_run_dataset, tester.results_dir, dataset_name,
+                                dataset_path, min_utilities): (dataset_name, min_utilities)
+                for dataset_name, dataset_path, min_utilities in jobs
+            }
             
-            try:
-                # Run centralized baseline
-                centralized_result = tester.run_centralized_baseline(dataset_path, min_utility)
-                
-                # Run federated without Laplace DP
-                federated_result = tester.run_federated_without_laplace(
-                    dataset_path, min_utility, num_clients=5, num_rounds=3, iid=True
-                )
-                
-                # Test pseudo-projection effectiveness
-                pp_result = tester.test_pseudo_projection_effectiveness(dataset_path, min_utility)
-                
-                # Run scalability test (only for first min_utility to save time)
-                scalability_result = None
-                if min_utility == min_utilities[0]:
-                    scalability_result = tester.run_scalability_test(dataset_path, min_utility)
-                
-                all_results[test_key] = {
-                    'centralized': centralized_result,
-                    'federated': federated_result,
-                    'pseudo_projection': pp_result,
-                    'scalability': scalability_result
-                }
-                
-                # Print summary
-                print(f"\n--- Results Summary for {test_key} ---")
-                print(f"Centralized HUIs: {centralized_result.get('num_huis', 0)}")
-                print(f"Federated HUIs: {federated_result.get('num_global_huis', 0)}")
-                print(f"Centralized Runtime: {centralized_result.get('runtime_seconds', 0):.2f}s")
-                print(f"Federated Runtime: {federated_result.get('runtime_seconds', 0):.2f}s")
-                
-                if pp_result and 'improvements' in pp_result:
-                    improvements = pp_result['improvements']
-                    print(f"Pseudo-projection Runtime Improvement: {improvements.get('runtime_improvement_percent', 0):.1f}%")
-                    print(f"Pseudo-projection Memory Improvement: {improvements.get('memory_improvement_percent', 0):.1f}%")
-                
-            except Exception as e:
-                print(f"Error testing {test_key}: {e}")
-                traceback.print_exc()
-                all_results[test_key] = {'error': str(e)}
+            for future in as_completed(future_to_job):
+                dataset_name, min_utilities = future_to_job[future]
+                try:
+                    collected.update(future.result())
+                except Exception as e:
+                    print(f"Error testing {dataset_name}: {e}")
+                    for min_utility in min_utilities:
+                        collected[f"{dataset_name}_{min_utility}"] = {'error': str(e)}
+        
+        # Keep the report in configuration order regardless of completion order
+        all_results = {
+            f"{dataset_name}_{min_utility}": collected[f"{dataset_name}_{min_utility}"]
+            for dataset_name, _, min_utilities in jobs
+            for min_utility in min_utilities
+        }
     
     # Generate comprehensive report
     report = tester.generate_comprehensive_report(all_results)